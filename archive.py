@@ -0,0 +1,124 @@
+import os
+import numpy as np
+import pandas as pd
+
+# Number of rows read from a snapshot at a time
+CHUNK_SIZE = 100_000
+
+columnar_folder = "columnar"
+
+def iter_snapshot_chunks(source, start=None, end=None, chunksize=CHUNK_SIZE):
+    """
+    Stream the saved snapshots of a dataset in chunks.
+
+    Snapshots converted with to_columnar are read through memory-mapped NumPy
+    files, all others (and snapshots whose CSV was saved again after the
+    conversion) are read from the CSV in chunks, so only one chunk is held in
+    memory at a time.
+
+    Args:
+        source (DatasetSource): The plugin or theme dataset.
+        start (str): The first date (YYYY-MM-DD) to include, or None for no limit.
+        end (str): The last date (YYYY-MM-DD) to include, or None for no limit.
+        chunksize (int): The maximum number of rows per chunk.
+
+    Yields:
+        tuple: Snapshot date, array of ids and array of download counts.
+    """
+    for date, path in source.list_snapshots():
+        if (start is not None and date < start) or (end is not None and date > end):
+            continue
+
+        ids_path, counts_path = get_columnar_paths(source, date)
+        if is_columnar_current(path, counts_path):
+            ids = np.load(ids_path, mmap_mode='r')
+            counts = np.load(counts_path, mmap_mode='r')
+            for i in range(0, len(counts), chunksize):
+                yield date, np.asarray(ids[i:i + chunksize]), np.asarray(counts[i:i + chunksize])
+        else:
+            for chunk in pd.read_csv(path, usecols=['Name', source.count_column], chunksize=chunksize, keep_default_na=False):
+                yield date, chunk['Name'].to_numpy(dtype=str), chunk[source.count_column].to_numpy(dtype=np.int64)
+
+def get_columnar_paths(source, date):
+    """
+    Return the paths of the memory-mappable id and count files of a snapshot.
+    """
+    directory = os.path.join(source.save_path, columnar_folder)
+    return (os.path.join(directory, f"{source.name}_{date}_ids.npy"),
+            os.path.join(directory, f"{source.name}_{date}_counts.npy"))
+
+def is_columnar_current(csv_path, counts_path):
+    """
+    Check whether the columnar files of a snapshot exist and are not older than its CSV.
+    """
+    return os.path.exists(counts_path) and os.path.getmtime(counts_path) >= os.path.getmtime(csv_path)
+
+def to_columnar(source, chunksize=CHUNK_SIZE):
+    """
+    Convert saved CSV snapshots into memory-mappable NumPy files.
+
+    Snapshots that were already converted are skipped, unless their CSV was saved
+    again after the conversion. Each CSV is read twice in
+    chunks (once to size the arrays, once to fill them), so memory use stays bounded.
+
+    Args:
+        source (DatasetSource): The plugin or theme dataset.
+        chunksize (int): The maximum number of rows per chunk.
+    """
+    directory = os.path.join(source.save_path, columnar_folder)
+    if not os.path.exists(directory):
+        os.makedirs(directory)
+
+    for date, path in source.list_snapshots():
+        ids_path, counts_path = get_columnar_paths(source, date)
+        if is_columnar_current(path, counts_path):
+            continue
+
+        rows, width = 0, 1
+        for chunk in pd.read_csv(path, usecols=['Name'], chunksize=chunksize, keep_default_na=False):
+            rows += len(chunk)
+            width = max(width, int(chunk['Name'].str.len().max() or 1))
+
+        ids = np.lib.format.open_memmap(f"{ids_path}.tmp", mode='w+', dtype=f'<U{width}', shape=(rows,))
+        counts = np.lib.format.open_memmap(f"{counts_path}.tmp", mode='w+', dtype=np.int64, shape=(rows,))
+        offset = 0
+        for chunk in pd.read_csv(path, usecols=['Name', source.count_column], chunksize=chunksize, keep_default_na=False):
+            ids[offset:offset + len(chunk)] = chunk['Name'].to_numpy(dtype=str)
+            counts[offset:offset + len(chunk)] = chunk[source.count_column].to_numpy(dtype=np.int64)
+            offset += len(chunk)
+        ids.flush()
+        counts.flush()
+        del ids, counts
+
+        # Rename the counts last, since their presence marks a finished conversion
+        os.replace(f"{ids_path}.tmp", ids_path)
+        os.replace(f"{counts_path}.tmp", counts_path)
+        print(f"Converted {path} to columnar files.")
+
+def get_snapshot_totals(source, start=None, end=None):
+    """
+    Calculate the number of items and the total downloads of every snapshot.
+
+    Returns:
+        DataFrame: Count and downloads indexed by snapshot date.
+    """
+    totals = {}
+    for date, ids, counts in iter_snapshot_chunks(source, start, end):
+        count, downloads = totals.get(date, (0, 0))
+        totals[date] = (count + len(counts), downloads + int(counts.sum()))
+    return pd.DataFrame.from_dict(totals, orient='index', columns=['counts', 'downloads'])
+
+def get_monthly_totals(source, start=None, end=None):
+    """
+    Calculate monthly item counts and downloads from the snapshot archive.
+
+    Like the monthly JSON files, every month uses its newest snapshot.
+
+    Returns:
+        dict: 'counts' and 'downloads' mapped to dictionaries of month (YYYY-MM) and value.
+    """
+    totals = get_snapshot_totals(source, start, end)
+    if totals.empty:
+        return {'counts': {}, 'downloads': {}}
+    monthly = totals.groupby(totals.index.str[:7]).last()
+    return {metric: {month: int(value) for month, value in monthly[metric].items()} for metric in monthly.columns}
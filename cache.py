@@ -0,0 +1,105 @@
+import os
+import json
+import time
+import hashlib
+import threading
+import requests
+
+cache_path = "cache"
+
+# In offline mode no network requests are made and only cached copies are served
+offline = False
+
+def set_offline(enabled=True):
+    """
+    Enable or disable offline mode.
+    """
+    global offline
+    offline = enabled
+
+def get_cached_json(url, headers=None, max_age=24 * 60 * 60):
+    """
+    Fetch JSON data from a URL, reusing a local copy if it is recent enough.
+
+    If the request fails, or in offline mode, the cached copy is returned
+    regardless of its age.
+
+    Args:
+        url (str): The URL to retrieve JSON data from.
+        headers (dict): Optional HTTP headers for the request.
+        max_age (int): Maximum age of the cached copy in seconds, or None if it never expires.
+
+    Returns:
+        The decoded JSON data, or None if it could not be fetched.
+    """
+    return fetch_cached_json(url, headers, max_age)[0]
+
+def fetch_cached_json(url, headers=None, max_age=24 * 60 * 60):
+    """
+    Like get_cached_json, but also report whether the data is fresh.
+
+    Returns:
+        tuple: The decoded JSON data (or None) and whether it was downloaded now or
+        served from a cached copy younger than max_age. A stale copy served because
+        the request failed, or in offline mode, is not fresh.
+    """
+    file_path = get_cache_file(url)
+
+    # Serve the cached copy while it is still fresh
+    if os.path.exists(file_path) and (max_age is None or time.time() - os.path.getmtime(file_path) < max_age):
+        with open(file_path, 'r', encoding='utf-8') as file:
+            return json.load(file), True
+
+    if offline:
+        return load_cache_file(file_path), False
+
+    try:
+        response = requests.get(url, headers=headers)
+        if response.status_code != 200:
+            print(f"Error fetching data from {url}. Status code: {response.status_code}")
+            # Fall back to a stale copy rather than returning nothing
+            return load_cache_file(file_path), False
+        data = response.json()
+    except (requests.RequestException, ValueError) as e:
+        print(f"Error fetching data from {url}: {e}")
+        return load_cache_file(file_path), False
+
+    save_cache_file(file_path, data)
+    return data, True
+
+def invalidate(url):
+    """
+    Remove the cached copy of a URL, e.g. after its data was rejected.
+    """
+    file_path = get_cache_file(url)
+    if os.path.exists(file_path):
+        os.remove(file_path)
+
+def load_cache_file(file_path):
+    """
+    Load a cache file regardless of its age, or return None if it does not exist.
+    """
+    if not os.path.exists(file_path):
+        return None
+    with open(file_path, 'r', encoding='utf-8') as file:
+        return json.load(file)
+
+def get_cache_file(url):
+    """
+    Return the path of the cache file used for a URL.
+    """
+    key = hashlib.sha256(url.encode('utf-8')).hexdigest()[:16]
+    return os.path.join(cache_path, f"{key}.json")
+
+def save_cache_file(file_path, data):
+    """
+    Write JSON data to a cache file atomically.
+    """
+    if not os.path.exists(cache_path):
+        os.makedirs(cache_path)
+
+    # Write to a temporary file first so an interrupted run never leaves a truncated cache entry
+    temp_path = f"{file_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as file:
+        json.dump(data, file)
+    os.replace(temp_path, file_path)
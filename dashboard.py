@@ -0,0 +1,282 @@
+import os
+import json
+import base64
+import numpy as np
+import plugins
+import themes
+import releases
+
+# Maximum number of points kept per series after downsampling
+MAX_POINTS = 300
+
+def export_dashboard(file_path, max_points=MAX_POINTS):
+    """
+    Write a self-contained HTML dashboard generated offline from the saved data.
+
+    Time series are downsampled with LTTB and embedded as base64-encoded binary
+    arrays, so the page stays small and loads quickly even with years of daily
+    per-plugin history.
+
+    Args:
+        file_path (str): The HTML file to write.
+        max_points (int): The maximum number of points per series.
+    """
+    payload = {
+        'plugins': get_dataset_payload(plugins.source, max_points),
+        'themes': get_dataset_payload(themes.source, max_points),
+        'releases': get_release_payload(releases.source)
+    }
+
+    # Escape markup characters so ids such as theme names cannot close the script element
+    data = json.dumps(payload, separators=(',', ':')).replace('<', '\\u003c').replace('>', '\\u003e').replace('&', '\\u0026')
+    html = DASHBOARD_TEMPLATE.replace("__DATA__", data)
+    directory = os.path.dirname(file_path)
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory)
+    with open(file_path, 'w', encoding='utf-8') as file:
+        file.write(html)
+    print(f"Dashboard saved in {file_path} ({len(html) / 1024:.0f} KB)")
+
+def get_dataset_payload(source, max_points):
+    """
+    Build the embedded data of the plugin or theme dataset.
+
+    Args:
+        source (DatasetSource): The dataset to load the saved data from.
+        max_points (int): The maximum number of points per series.
+
+    Returns:
+        dict: Monthly series and per-item series, encoded for the dashboard.
+    """
+    monthly = {}
+    for metric, values in source.load_monthly().items():
+        months = sorted(values)
+        monthly[f"Monthly {source.name} {metric}"] = {
+            'x': encode_array(np.array(months, dtype='datetime64[D]').astype(np.int32)),
+            'y': encode_array(np.array([values[month] for month in months], dtype=np.float64))
+        }
+
+    ids, dates, matrix = source.load_range()
+
+    # Downsample every series and pack them into flat arrays with offsets
+    indices, values, offsets = [], [], [0]
+    for row in matrix:
+        valid = np.flatnonzero(~np.isnan(row))
+        keep = valid[lttb(valid.astype(float), row[valid], max_points)]
+        indices.append(keep)
+        values.append(row[keep])
+        offsets.append(offsets[-1] + len(keep))
+
+    # Order items by their latest download count so the page can list the top items first
+    latest = np.nan_to_num(matrix[:, -1], nan=-1) if matrix.size else np.array([])
+    order = np.argsort(-latest, kind='stable')
+    offsets = np.array(offsets)
+
+    return {
+        'monthly': monthly,
+        'ids': [ids[i] for i in order],
+        'dates': encode_array(dates.astype(np.int32)),
+        'bounds': encode_array(np.column_stack([offsets[order], offsets[order + 1]]).ravel().astype(np.int32)),
+        'indices': encode_array(np.concatenate(indices).astype(np.int32) if indices else np.array([], dtype=np.int32)),
+        'values': encode_array(np.concatenate(values) if values else np.array([]))
+    }
+
+def get_release_payload(source):
+    """
+    Build the embedded data of the release dataset from the newest snapshot with download counts.
+    """
+    df = source.load_latest()
+    if df.empty:
+        return {'versions': [], 'platforms': {}}
+    return {
+        'versions': df['version'].tolist(),
+        'platforms': {platform: encode_array(df[platform].to_numpy(dtype=float)) for platform in ['Linux', 'Windows', 'MacOS']}
+    }
+
+def lttb(x, y, threshold):
+    """
+    Select the points to keep with the Largest-Triangle-Three-Buckets algorithm.
+
+    Args:
+        x (ndarray): The x values in ascending order.
+        y (ndarray): The y values.
+        threshold (int): The number of points to keep.
+
+    Returns:
+        ndarray: The indices of the points to keep.
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    # Bucket boundaries for the points between the fixed first and last point
+    edges = np.linspace(1, n - 1, threshold - 1).astype(int)
+    selected = np.empty(threshold, dtype=int)
+    selected[0], selected[-1] = 0, n - 1
+
+    previous = 0
+    for bucket in range(threshold - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        next_end = edges[bucket + 2] if bucket + 2 < len(edges) else n
+        next_x = x[end:next_end].mean() if next_end > end else x[-1]
+        next_y = y[end:next_end].mean() if next_end > end else y[-1]
+
+        # Keep the point that forms the largest triangle with the previous and the next bucket
+        areas = np.abs((x[previous] - next_x) * (y[start:end] - y[previous]) - (x[previous] - x[start:end]) * (next_y - y[previous]))
+        previous = start + int(np.argmax(areas))
+        selected[bucket + 1] = previous
+    return selected
+
+def encode_array(values):
+    """
+    Encode a numeric array as base64 of little-endian binary data.
+
+    Integer arrays are stored as int32 and everything else as float64, matching
+    the typed arrays used to decode them in the page.
+    """
+    values = np.asarray(values)
+    dtype = '<i4' if np.issubdtype(values.dtype, np.integer) else '<f8'
+    return base64.b64encode(values.astype(dtype).tobytes()).decode('ascii')
+
+DASHBOARD_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>Obsidian Data Statistics</title>
+<style>
+body { font-family: sans-serif; margin: 2em; color: #222; }
+h2 { color: #773ee9; }
+canvas { width: 100%; height: 320px; border: 1px solid #ddd; }
+input { padding: 4px; width: 320px; }
+</style>
+</head>
+<body>
+<h1>Obsidian Data Statistics</h1>
+<div id="sections"></div>
+<script>
+const DATA = __DATA__;
+const COLORS = ['#773ee9', '#808080', '#e9a23e', '#3ea2e9', '#3ee98c'];
+
+function decode(text, Type) {
+  const binary = atob(text);
+  const bytes = new Uint8Array(binary.length);
+  for (let i = 0; i < binary.length; i++) bytes[i] = binary.charCodeAt(i);
+  return new Type(bytes.buffer);
+}
+
+function dayToString(day) {
+  return new Date(day * 86400000).toISOString().slice(0, 10);
+}
+
+function drawLines(canvas, series) {
+  const ctx = canvas.getContext('2d');
+  canvas.width = canvas.clientWidth; canvas.height = canvas.clientHeight;
+  ctx.clearRect(0, 0, canvas.width, canvas.height);
+  const points = series.flatMap(s => Array.from(s.x, (x, i) => [x, s.y[i]]));
+  if (!points.length) return;
+  const minX = Math.min(...points.map(p => p[0])), maxX = Math.max(...points.map(p => p[0]));
+  const maxY = Math.max(...points.map(p => p[1])) || 1;
+  const pad = 50, w = canvas.width - 2 * pad, h = canvas.height - 2 * pad;
+  const sx = x => pad + (maxX > minX ? (x - minX) / (maxX - minX) : 0.5) * w;
+  const sy = y => pad + h - y / maxY * h;
+  ctx.fillStyle = '#222'; ctx.font = '12px sans-serif';
+  ctx.fillText(maxY.toLocaleString(), 4, pad);
+  ctx.fillText(dayToString(minX), pad, canvas.height - 10);
+  ctx.fillText(dayToString(maxX), canvas.width - pad - 70, canvas.height - 10);
+  series.forEach((s, k) => {
+    ctx.strokeStyle = COLORS[k % COLORS.length]; ctx.lineWidth = 2; ctx.beginPath();
+    s.x.forEach((x, i) => i ? ctx.lineTo(sx(x), sy(s.y[i])) : ctx.moveTo(sx(x), sy(s.y[i])));
+    ctx.stroke();
+    ctx.fillStyle = COLORS[k % COLORS.length];
+    ctx.fillText(s.name, pad + 10 + 160 * k, 20);
+  });
+}
+
+function drawBars(canvas, labels, stacks) {
+  const ctx = canvas.getContext('2d');
+  canvas.width = canvas.clientWidth; canvas.height = canvas.clientHeight;
+  const names = Object.keys(stacks);
+  const totals = labels.map((_, i) => names.reduce((sum, name) => sum + stacks[name][i], 0));
+  const maxY = Math.max(...totals, 1), pad = 50;
+  const barWidth = (canvas.width - 2 * pad) / Math.max(labels.length, 1);
+  ctx.font = '12px sans-serif';
+  labels.forEach((label, i) => {
+    let y = canvas.height - pad;
+    names.forEach((name, k) => {
+      const height = stacks[name][i] / maxY * (canvas.height - 2 * pad);
+      ctx.fillStyle = COLORS[k % COLORS.length];
+      ctx.fillRect(pad + i * barWidth, y - height, barWidth * 0.8, height);
+      y -= height;
+    });
+  });
+  names.forEach((name, k) => { ctx.fillStyle = COLORS[k % COLORS.length]; ctx.fillText(name, pad + 10 + 100 * k, 20); });
+  ctx.fillStyle = '#222';
+  ctx.fillText(maxY.toLocaleString(), 4, pad);
+  if (labels.length) {
+    ctx.fillText(labels[0], pad, canvas.height - 10);
+    ctx.fillText(labels[labels.length - 1], canvas.width - pad - 60, canvas.height - 10);
+  }
+}
+
+function addSection(title) {
+  const section = document.createElement('section');
+  const heading = document.createElement('h2');
+  heading.textContent = title;
+  section.appendChild(heading);
+  document.getElementById('sections').appendChild(section);
+  return section;
+}
+
+function addCanvas(section) {
+  const canvas = document.createElement('canvas');
+  section.appendChild(canvas);
+  return canvas;
+}
+
+function addDataset(name, dataset) {
+  const section = addSection(name.charAt(0).toUpperCase() + name.slice(1));
+  Object.entries(dataset.monthly).forEach(([title, s]) => {
+    drawLines(addCanvas(section), [{name: title, x: decode(s.x, Int32Array), y: decode(s.y, Float64Array)}]);
+  });
+  if (!dataset.ids.length) return;
+
+  const dates = decode(dataset.dates, Int32Array);
+  const bounds = decode(dataset.bounds, Int32Array);
+  const indices = decode(dataset.indices, Int32Array);
+  const values = decode(dataset.values, Float64Array);
+  const series = i => ({
+    name: dataset.ids[i],
+    x: Array.from(indices.subarray(bounds[2 * i], bounds[2 * i + 1]), j => dates[j]),
+    y: values.subarray(bounds[2 * i], bounds[2 * i + 1])
+  });
+
+  const list = document.createElement('datalist');
+  list.id = name + '-ids';
+  dataset.ids.forEach(id => {
+    const option = document.createElement('option');
+    option.value = id;
+    list.appendChild(option);
+  });
+  const input = document.createElement('input');
+  input.setAttribute('list', list.id);
+  input.placeholder = 'Compare ' + name + ' (comma separated)';
+  section.append(list, input);
+  const canvas = addCanvas(section);
+  const update = () => {
+    const wanted = input.value.split(',').map(s => s.trim()).filter(Boolean);
+    const selected = wanted.length ? wanted.map(id => dataset.ids.indexOf(id)).filter(i => i >= 0) : [0, 1, 2, 3, 4].filter(i => i < dataset.ids.length);
+    drawLines(canvas, selected.map(series));
+  };
+  input.addEventListener('change', update);
+  update();
+}
+
+addDataset('plugins', DATA.plugins);
+addDataset('themes', DATA.themes);
+const releases = addSection('Releases');
+const platforms = Object.fromEntries(Object.entries(DATA.releases.platforms).map(([k, v]) => [k, decode(v, Float64Array)]));
+drawBars(addCanvas(releases), DATA.releases.versions, platforms);
+</script>
+</body>
+</html>
+"""
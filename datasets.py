@@ -0,0 +1,581 @@
+import os
+import re
+import csv
+import numpy as np
+import pandas as pd
+import requests
+import json
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+import matplotlib.pyplot as plt
+from matplotlib.colors import LinearSegmentedColormap, to_rgb
+import archive
+import cache
+import validation
+import render_cache
+
+DEFAULT_REPO = "obsidianmd/obsidian-releases"
+RAW_ROOT = "https://raw.githubusercontent.com"
+API_ROOT = "https://api.github.com"
+
+# Number of sources, and of files per source, downloaded at the same time
+MAX_WORKERS = 8
+
+# How long a fetched stats snapshot is reused before it is downloaded again, in seconds
+stats_max_age = 60 * 60
+
+# Headers for authentication with the GitHub API
+TOKEN_PLACEHOLDER = "Insert your Github token here. You can generate one here https://github.com/settings/tokens"
+headers = {
+    "Authorization": TOKEN_PLACEHOLDER
+}
+
+class DatasetSource:
+    """
+    A dataset published in obsidian-releases or in a fork or mirror of it.
+
+    Subclasses describe where the data lives and how a snapshot is summarized per
+    month. Fetching, incremental history updates, persisting and loading saved
+    snapshots are shared by all datasets.
+    """
+    # The dataset name, also used as the prefix of the dated snapshot files
+    name = None
+    # The directory the snapshots and monthly series of the default repository are saved in
+    save_path = None
+    # The URL of the latest stats snapshot
+    stats_url = None
+    # The key of the download count in a stats entry and the matching CSV column
+    count_key = None
+    count_column = None
+    # The file in the repository whose commit history gives the monthly series
+    history_path = None
+    # The URL of the catalog with the metadata of every item, and the key of the item id in it
+    catalog_url = None
+    catalog_key = None
+    # Monthly metric mapped to the JSON file it is saved in
+    monthly_files = {}
+    # Monthly metrics that must never decrease
+    cumulative_metrics = set()
+    # Whether the last fetch was served from a saved snapshot instead of the network
+    fallback = False
+
+    def __init__(self, repo=DEFAULT_REPO, path=None, raw_root=RAW_ROOT, api_root=API_ROOT, request_headers=None):
+        """
+        Args:
+            repo (str): The repository in "owner/name" form.
+            path (str): Optional file path replacing history_path, for mirrors with a different layout.
+            raw_root (str): The root URL for raw file downloads of the repository host.
+            api_root (str): The root URL of the repository host's API.
+            request_headers (dict): Optional headers for the API, stats and raw file requests of
+                a mirror. By default the GitHub token in headers is only sent to the GitHub API,
+                never to other hosts, and raw files are requested without headers.
+        """
+        self.repo = repo
+        # Monthly series rebuilt from the snapshot archive, which are not saved
+        self.archive_metrics = set()
+        self.raw_root = raw_root
+        self.api_root = api_root
+        if request_headers is not None:
+            self.headers = request_headers
+            self.raw_headers = request_headers
+        else:
+            # An unconfigured token would make GitHub reject otherwise anonymous requests
+            token_configured = headers.get("Authorization") != TOKEN_PLACEHOLDER
+            self.headers = headers if api_root == API_ROOT and token_configured else {}
+            self.raw_headers = {}
+        if path is not None:
+            self.history_path = path
+        # Other repositories are kept apart in a subfolder named after the repository
+        if repo != DEFAULT_REPO:
+            self.save_path = os.path.join(self.save_path, repo.replace('/', '__'))
+
+    @property
+    def label(self):
+        """
+        The repository the data comes from, used to tell sources apart in charts.
+        """
+        return self.repo
+
+    @property
+    def qualified_name(self):
+        """
+        The dataset name, followed by the repository for forks and mirrors, e.g. for quarantined files.
+        """
+        return self.name if self.repo == DEFAULT_REPO else f"{self.name}_{self.repo.replace('/', '__')}"
+
+    def get_raw_url(self, path, ref='master'):
+        """
+        Return the URL of a file of the repository at a branch or commit.
+        """
+        return f"{self.raw_root}/{self.repo}/{ref}/{path}"
+
+    def fetch(self):
+        """
+        Fetch the latest stats snapshot through the cache.
+
+        Snapshots that fail validation are quarantined. If the snapshot is rejected,
+        cannot be fetched, or offline mode is enabled, the newest saved snapshot is
+        returned instead. A stale cached copy served because the request failed is
+        used for charts, but fallback stays set so it is never saved as today's snapshot.
+
+        Returns:
+            dict: Stats data keyed by id.
+        """
+        self.fallback = True
+        data, fresh = cache.fetch_cached_json(self.stats_url, self.raw_headers, max_age=stats_max_age) if self.stats_url else (None, False)
+        if data is None:
+            print(f"Using the latest saved {self.name} snapshot instead.")
+            return self.load_latest()
+
+        # Reject snapshots that are truncated or whose cumulative counts went down
+        snapshots = self.list_snapshots()
+        previous_age_days = (datetime.now() - datetime.strptime(snapshots[-1][0], "%Y-%m-%d")).days if snapshots else 0
+        problems = validation.validate_stats_snapshot(data, self.count_key, self.load_latest_counts(), previous_age_days=previous_age_days)
+        if problems and validation.accept_invalid:
+            print(f"Accepting the {self.name} snapshot despite validation problems: {' '.join(problems)}")
+        elif problems:
+            validation.quarantine_snapshot(data, self.qualified_name, problems)
+            cache.invalidate(self.stats_url)
+            print(f"Using the latest saved {self.name} snapshot instead.")
+            return self.load_latest()
+        if not fresh:
+            print(f"The {self.name} snapshot is an outdated cached copy and will not be saved.")
+            return data
+        self.fallback = False
+        return data
+
+    def update_history(self):
+        """
+        Update the monthly series from the commit history of history_path.
+
+        Only commits since the newest saved month are requested, and the file of
+        every commit is cached by its sha, so a run only downloads what is new.
+        If the commit history cannot be fetched, or in offline mode, the saved
+        series are returned, and series without a saved file are rebuilt from
+        the snapshot archive (see add_archive_totals).
+
+        Returns:
+            dict: Monthly metric mapped to a dictionary of month (YYYY-MM) and value.
+        """
+        history = self.load_monthly()
+        if self.history_path is None or cache.offline:
+            return self.add_archive_totals(history)
+
+        # The newest saved month may have received commits since, so it is updated too
+        months = sorted(set().union(*history.values()))
+        since = f"{months[-1]}-01T00:00:00Z" if months else None
+
+        try:
+            commits = get_all_commits(self.api_root, self.repo, self.history_path, since, self.headers)
+            if commits is None:
+                raise Exception("Error fetching commit history. Due to rate limit or missing GitHub token. Using local JSON data instead.")
+
+            # Files at a given commit never change, so they are cached without expiry
+            monthly_commits = get_monthly_commits(commits)
+            urls = [self.get_raw_url(self.history_path, commit_sha) for commit_sha in monthly_commits.values()]
+            with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+                files = list(executor.map(lambda url: cache.get_cached_json(url, self.raw_headers, max_age=None), urls))
+
+            for month_year, data in zip(monthly_commits, files):
+                if data is None:
+                    continue
+                problems = self.validate_history_snapshot(data)
+                if problems:
+                    validation.quarantine_snapshot(data, f"{self.qualified_name}_{month_year}", problems)
+                    continue
+                for metric, value in self.summarize_history_snapshot(data).items():
+                    history.setdefault(metric, {})[month_year] = value
+        except Exception as e:
+            print("Error:", str(e))
+            self.add_archive_totals(history)
+
+        for metric, values in history.items():
+            validation.report_problems(validation.validate_monthly_series(values, f"Monthly {self.name} {metric}", metric in self.cumulative_metrics))
+        return history
+
+    def add_archive_totals(self, history):
+        """
+        Fill monthly series without a saved file from the totals of the saved snapshots.
+
+        The rebuilt series only cover the months with saved snapshots, so they are
+        used for charts but never saved, which would cut off the history requested
+        from the repository later.
+
+        Args:
+            history (dict): Monthly metric mapped to a dictionary of month (YYYY-MM) and value.
+
+        Returns:
+            dict: The same history with the missing series added.
+        """
+        missing = [metric for metric in self.monthly_files if metric not in history]
+        if not missing:
+            return history
+        totals = archive.get_monthly_totals(self)
+        for metric in missing:
+            if totals.get(metric):
+                history[metric] = totals[metric]
+                self.archive_metrics.add(metric)
+                print(f"Monthly {self.name} {metric} rebuilt from the saved snapshots.")
+        return history
+
+    def validate_history_snapshot(self, data):
+        """
+        Check a historic version of history_path. Returns a list of problems; by default none are found.
+        """
+        return []
+
+    def summarize_history_snapshot(self, data):
+        """
+        Reduce a historic version of history_path to one value per monthly metric; by default there are none.
+        """
+        return {}
+
+    def persist(self, data, history):
+        """
+        Save the latest snapshot and the monthly series.
+
+        A snapshot that was served from the saved data is not saved again.
+        """
+        if self.fallback:
+            print(f"The {self.name} snapshot was loaded from saved data and is not saved again.")
+        else:
+            self.save_snapshot(data)
+        self.save_monthly(history)
+
+    def save_snapshot(self, data):
+        """
+        Save the latest snapshot to a CSV file with the current date in the filename.
+
+        Args:
+            data (dict): Stats data keyed by id.
+        """
+        if not data:
+            print(f"No {self.name} data to save.")
+            return
+
+        # Keep only the download count and sort by it
+        sorted_data = sorted(data.items(), key=lambda item: item[1][self.count_key], reverse=True)
+
+        if not os.path.exists(self.save_path):
+            os.makedirs(self.save_path)
+
+        current_date = datetime.now().strftime("%Y-%m-%d")
+        file_path = os.path.join(self.save_path, f'{self.name}_{current_date}.csv')
+
+        with open(file_path, mode='w', newline='', encoding='utf-8') as file:
+            writer = csv.writer(file)
+            writer.writerow(['Name', self.count_column])
+            for item, values in sorted_data:
+                writer.writerow([item, values[self.count_key]])
+
+        print(f"Latest {self.name} data saved in {file_path}")
+
+    def save_monthly(self, history):
+        """
+        Save every monthly series to its JSON file, newest month first.
+        """
+        if not os.path.exists(self.save_path):
+            os.makedirs(self.save_path)
+
+        for metric, file_name in self.monthly_files.items():
+            if metric not in history or metric in self.archive_metrics:
+                continue
+            filename = os.path.join(self.save_path, file_name)
+            values = dict(sorted(history[metric].items(), reverse=True))
+            with open(filename, "w") as f:
+                json.dump(values, f, indent=4)
+            print(f"Monthly {self.name} {metric} saved in {filename}.")
+
+    def load_monthly(self):
+        """
+        Load the saved monthly series.
+
+        Returns:
+            dict: Monthly metric mapped to a dictionary of month (YYYY-MM) and value.
+        """
+        history = {}
+        for metric, file_name in self.monthly_files.items():
+            file_path = os.path.join(self.save_path, file_name)
+            try:
+                with open(file_path, 'r') as file:
+                    history[metric] = json.load(file)
+            except FileNotFoundError as e:
+                print("File not found:", str(e))
+        return history
+
+    def list_snapshots(self):
+        """
+        List the saved snapshots in date order.
+
+        Returns:
+            list: Tuples of snapshot date (YYYY-MM-DD) and file path.
+        """
+        if not os.path.exists(self.save_path):
+            return []
+        pattern = re.compile(rf'{re.escape(self.name)}_(\d{{4}}-\d{{2}}-\d{{2}})\.csv')
+        snapshots = []
+        for f in sorted(os.listdir(self.save_path)):
+            match = pattern.fullmatch(f)
+            if match:
+                snapshots.append((match.group(1), os.path.join(self.save_path, f)))
+        return snapshots
+
+    def load_latest_counts(self):
+        """
+        Load the download counts of the newest saved snapshot.
+
+        Returns:
+            dict: Id mapped to its download count, or an empty dictionary if nothing was saved.
+        """
+        snapshots = self.list_snapshots()
+        if not snapshots:
+            return {}
+        df = pd.read_csv(snapshots[-1][1], keep_default_na=False)
+        return dict(zip(df['Name'], df[self.count_column]))
+
+    def load_latest(self):
+        """
+        Load the newest saved snapshot in the format returned by fetch.
+        """
+        return {item: {self.count_key: count} for item, count in self.load_latest_counts().items()}
+
+    def load_range(self, start=None, end=None):
+        """
+        Load the saved snapshots between two dates into an (id x date) matrix.
+
+        Args:
+            start (str): The first date (YYYY-MM-DD) to include, or None for no limit.
+            end (str): The last date (YYYY-MM-DD) to include, or None for no limit.
+
+        The snapshots are streamed, but the returned matrix holds the whole
+        selected range, so memory use grows with the number of ids times dates.
+
+        Returns:
+            tuple: The list of ids, the array of snapshot dates and the matrix of
+            download counts (NaN where an id is missing from a snapshot).
+        """
+        # Stream the snapshots chunk by chunk and scatter every chunk into the matrix right away,
+        # so besides the result only one chunk is held in memory
+        dates = [date for date, _ in self.list_snapshots() if (start is None or date >= start) and (end is None or date <= end)]
+        column_of = {date: column for column, date in enumerate(dates)}
+        id_index = {}
+        matrix = np.full((0, len(dates)), np.nan)
+        filled = np.zeros(len(dates), dtype=bool)
+        for date, ids, counts in archive.iter_snapshot_chunks(self, start, end):
+            rows = np.array([id_index.setdefault(item, len(id_index)) for item in ids], dtype=np.int64)
+            if len(id_index) > len(matrix):
+                # Grow the rows geometrically, so new ids rarely cause a copy
+                grown = np.full((max(2 * len(matrix), len(id_index)), len(dates)), np.nan)
+                grown[:len(matrix)] = matrix
+                matrix = grown
+            matrix[rows, column_of[date]] = counts
+            filled[column_of[date]] = True
+
+        # Snapshots without rows are left out, like ids never seen
+        return list(id_index), np.array(dates, dtype='datetime64[D]')[filled], matrix[:len(id_index), filled]
+
+def fetch_all(sources):
+    """
+    Fetch the latest snapshot and update the history of several sources in parallel.
+
+    Args:
+        sources (list): The sources to fetch.
+
+    Returns:
+        list: A (data, history) tuple per source, in the order of sources.
+    """
+    def fetch_source(source):
+        return source.fetch(), source.update_history()
+
+    with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, max(len(sources), 1))) as executor:
+        return list(executor.map(fetch_source, sources))
+
+def create_sources(targets, source_class):
+    """
+    Create a source for each configured target of one kind.
+
+    Args:
+        targets (list): Target dictionaries as returned by load_targets.
+        source_class (type): The DatasetSource subclass of the kind.
+
+    Returns:
+        list: The created sources.
+    """
+    return [source_class(target['repo'], target.get('path'), target.get('raw_root', RAW_ROOT), target.get('api_root', API_ROOT), target.get('headers'))
+            for target in targets]
+
+def load_targets(file_path):
+    """
+    Load the configured source targets from a JSON file.
+
+    The file holds a list of objects with "repo", "kind" (plugins, themes or
+    releases) and optionally "path", "raw_root", "api_root" and "headers".
+
+    Args:
+        file_path (str): The JSON file with the targets.
+
+    Returns:
+        dict: Kind mapped to a list of target dictionaries.
+    """
+    with open(file_path, 'r', encoding='utf-8') as file:
+        targets = json.load(file)
+
+    grouped = {}
+    for target in targets:
+        if target.get('kind') not in ('plugins', 'themes', 'releases') or 'repo' not in target:
+            print(f"Ignoring invalid source target: {target}")
+            continue
+        grouped.setdefault(target['kind'], []).append(target)
+    return grouped
+
+def get_all_commits(api_root, repo, path, since=None, request_headers=None):
+    """
+    Retrieve all commits of a repository that touched a file.
+
+    Args:
+        api_root (str): The root URL of the repository host's API.
+        repo (str): The repository in "owner/name" form.
+        path (str): The file path in the repository.
+        since (str): Optional ISO 8601 timestamp; only newer commits are returned.
+        request_headers (dict): Optional HTTP headers, e.g. for authentication.
+
+    Returns:
+        list: A list of commit objects, newest first, or None if a request failed.
+    """
+    url = f"{api_root}/repos/{repo}/commits?path={path}&per_page=100"
+    if since:
+        url += f"&since={since}"
+
+    all_commits = []
+    while url:
+        response = requests.get(url, headers=request_headers)
+        if response.status_code != 200:
+            return None
+        all_commits.extend(response.json())
+        url = response.links['next']['url'] if 'next' in response.links else None
+    return all_commits
+
+def get_monthly_commits(commits):
+    """
+    Pick the newest commit of every month.
+
+    Args:
+        commits (list): Commit objects, newest first.
+
+    Returns:
+        dict: Month (YYYY-MM) mapped to a commit sha.
+    """
+    monthly_commits = {}
+    for commit in commits:
+        month_year = commit["commit"]["committer"]["date"][:7]  # Format: YYYY-MM
+        if month_year not in monthly_commits:
+            monthly_commits[month_year] = commit["sha"]
+    return monthly_commits
+
+def generate_gradient_colors(base_color_hex, num_colors):
+    """
+    Generate a gradient of colors starting from a base color in hexadecimal format.
+
+    Args:
+        base_color_hex (str): The base color in hexadecimal format (e.g., "#RRGGBB").
+        num_colors (int): The number of gradient colors to generate.
+
+    Returns:
+        list: A list of RGB colors forming the gradient.
+    """
+    # Convert the hexadecimal base color code to RGB
+    base_color_rgb = np.array(to_rgb(base_color_hex))
+
+    # Create a slightly lighter version of the base color for the beginning of the gradient
+    light_color = base_color_rgb + (1 - base_color_rgb) * 0.5  # Slightly lighten
+    light_color = np.clip(light_color, 0, 1)  # Ensure values are within a valid range
+
+    # Create a gradient from the lighter version of the base color (start) to the base color (end)
+    cmap = LinearSegmentedColormap.from_list('custom_gradient', [light_color, base_color_rgb], N=num_colors)
+    # Generate color values from the gradient, reversing the order
+    colors = cmap(np.linspace(0, 1, num_colors))[::-1]
+    return colors
+
+@render_cache.cached_figure
+def draw_monthly_graph(monthly_values, title, ylabel, scale=1):
+    """
+    Create a bar chart of a monthly series with gradient colors.
+
+    Args:
+        monthly_values (dict): Month (YYYY-MM) mapped to a value.
+        title (str): The chart title.
+        ylabel (str): The Y-axis label.
+        scale (float): The values are divided by this factor, e.g. 1_000_000 for millions.
+    """
+    # Sort the data to display the oldest data first.
+    months = sorted(monthly_values)
+    values = [monthly_values[month] / scale for month in months]
+
+    plt.figure(figsize=(15, 7))
+    colors = generate_gradient_colors('#773ee9', len(months))[::-1]
+    plt.bar(months, values, color=colors)
+    plt.xticks(rotation=45)
+    plt.xlabel('Month')
+    plt.ylabel(ylabel)
+    plt.title(title)
+    plt.tight_layout()
+    plt.show()
+
+@render_cache.cached_figure
+def draw_growth_graph(monthly_counts, title):
+    """
+    Draw a line graph showing the monthly growth rate of a count.
+
+    Args:
+        monthly_counts (dict): Month (YYYY-MM) mapped to a count.
+        title (str): The chart title.
+    """
+    # Sort the months in ascending order
+    months = sorted(monthly_counts.keys())
+    counts = [monthly_counts[month] for month in months]
+
+    # Calculate growth rates (in percentage), starting from the second month
+    growth_rates = []
+    for i in range(2, len(counts)):
+        growth_rate = ((counts[i] - counts[i-1]) / counts[i-1]) * 100
+        growth_rates.append(growth_rate)
+
+    plt.figure(figsize=(15, 7))
+    plt.plot(months[2:], growth_rates, marker='o', linestyle='-', color='#773ee9')
+
+    # Rotate months on the x-axis for better readability
+    plt.xticks(rotation=45)
+
+    plt.xlabel('Month')
+    plt.ylabel('Growth Rate (%)')
+    plt.title(title)
+
+    # Adjust layout and display grid lines
+    plt.tight_layout()
+    plt.grid(True, which='both', linestyle='--', linewidth=0.5)
+    plt.show()
+
+@render_cache.cached_figure
+def draw_source_comparison_graph(monthly_by_source, title, ylabel):
+    """
+    Create a line graph comparing a monthly series across sources.
+
+    Args:
+        monthly_by_source (dict): Source label mapped to a dictionary of month (YYYY-MM) and value.
+        title (str): The chart title.
+        ylabel (str): The Y-axis label.
+    """
+    months = sorted(set().union(*monthly_by_source.values()))
+
+    plt.figure(figsize=(15, 7))
+    for label, monthly_values in monthly_by_source.items():
+        plt.plot(months, [monthly_values.get(month, np.nan) for month in months], marker='o', linestyle='-', label=label)
+
+    plt.xticks(rotation=45)
+    plt.xlabel('Month')
+    plt.ylabel(ylabel)
+    plt.title(title)
+    plt.legend(title='Source')
+    plt.grid(True, linestyle='--', linewidth=0.5)
+    plt.tight_layout()
+    plt.show()
@@ -0,0 +1,228 @@
+import os
+from datetime import datetime
+import json
+import hashlib
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plt
+import cache
+import render_cache
+
+params_file = "forecast_params.json"
+
+# z value of a 95% prediction interval
+Z_95 = 1.96
+
+# Smoothing parameters tried when fitting Holt's linear trend model
+HOLT_GRID = [(alpha, beta) for alpha in (0.2, 0.4, 0.6, 0.8, 1.0) for beta in (0.05, 0.1, 0.2, 0.4)]
+
+def forecast_monthly(monthly_values, horizon=6, name=None):
+    """
+    Forecast a monthly series with Holt's linear trend model.
+
+    Args:
+        monthly_values (dict): Month (YYYY-MM) mapped to a value.
+        horizon (int): The number of months to forecast.
+        name (str): Optional name under which the fitted parameters are cached.
+
+    Returns:
+        DataFrame: Forecast, lower and upper bound of the 95% interval indexed by month.
+    """
+    if len(monthly_values) < 2:
+        return pd.DataFrame(columns=['forecast', 'lower', 'upper'])
+
+    months = sorted(monthly_values)
+    values = np.array([[monthly_values[month] for month in months]], dtype=float)
+
+    fit = get_cached_fits([name or 'monthly'], values, 'holt', fit_holt)[0]
+    forecast, lower, upper = project_holt(fit, horizon)
+
+    future = pd.period_range(pd.Period(months[-1], freq='M') + 1, periods=horizon, freq='M').strftime('%Y-%m')
+    return pd.DataFrame({'forecast': forecast, 'lower': lower, 'upper': upper}, index=future)
+
+def forecast_items(source, horizon_days=90):
+    """
+    Forecast the downloads of every item of a dataset from its saved snapshots.
+
+    A log-linear trend is fitted to every item at once. Snapshots may be irregularly
+    spaced and items may be missing from some of them.
+
+    Args:
+        source (DatasetSource): The plugin or theme dataset.
+        horizon_days (int): How many days after the newest snapshot to project.
+
+    Returns:
+        DataFrame: Latest count, daily growth rate, projection and its 95% interval per item.
+    """
+    ids, dates, matrix = source.load_range()
+    if len(dates) < 2:
+        print(f"At least two saved {source.name} snapshots are needed to forecast downloads.")
+        return pd.DataFrame()
+
+    days = (dates - dates[0]).astype(float)
+    fits = get_cached_fits([f"{source.name}:{item}" for item in ids], matrix, 'log_linear', lambda values: fit_log_linear(days, values))
+    target = days[-1] + horizon_days
+
+    rows = []
+    for item, fit in zip(ids, fits):
+        projection, lower, upper = project_log_linear(fit, np.array([target]))
+        rows.append((item, fit['last'], np.expm1(fit['slope']) * 100, projection[0], lower[0], upper[0]))
+    return pd.DataFrame(rows, columns=['id', 'latest', 'daily_growth_percent', 'projection', 'lower', 'upper']).set_index('id')
+
+def save_item_forecasts(source, horizon_days=90):
+    """
+    Forecast the downloads of every item of a dataset and save them to a CSV file.
+    """
+    forecasts = forecast_items(source, horizon_days)
+    if forecasts.empty:
+        return
+
+    current_date = datetime.now().strftime("%Y-%m-%d")
+    file_path = os.path.join(source.save_path, f'{source.name}_forecast_{current_date}.csv')
+    forecasts.to_csv(file_path, encoding='utf-8')
+    print(f"{horizon_days}-day {source.name} forecasts saved in {file_path}")
+
+def fit_log_linear(t, values):
+    """
+    Fit log(y) = intercept + slope * t to many series at once by weighted least squares.
+
+    Missing or non-positive values are ignored.
+
+    Args:
+        t (ndarray): The time of every column.
+        values (ndarray): Array of shape (series, time).
+
+    Returns:
+        list: A dictionary of fitted parameters per series.
+    """
+    weights = np.isfinite(values) & (values > 0)
+    log_values = np.where(weights, np.log(np.where(weights, values, 1)), 0)
+    t = np.broadcast_to(t, values.shape)
+
+    # Closed-form least squares using weighted sums over the time axis
+    n = weights.sum(axis=1)
+    sum_t = (weights * t).sum(axis=1)
+    sum_y = (weights * log_values).sum(axis=1)
+    sum_tt = (weights * t * t).sum(axis=1)
+    sum_ty = (weights * t * log_values).sum(axis=1)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        denominator = n * sum_tt - sum_t ** 2
+        slope = np.where(denominator > 0, (n * sum_ty - sum_t * sum_y) / denominator, 0.0)
+        intercept = np.where(n > 0, (sum_y - slope * sum_t) / n, 0.0)
+        residuals = weights * (log_values - intercept[:, None] - slope[:, None] * t)
+        sigma = np.sqrt((residuals ** 2).sum(axis=1) / np.maximum(n - 2, 1))
+        mean_t = np.where(n > 0, sum_t / n, 0.0)
+
+    last = np.array([row[mask][-1] if mask.any() else np.nan for row, mask in zip(values, weights)])
+    return [{'model': 'log_linear', 'intercept': float(intercept[i]), 'slope': float(slope[i]), 'sigma': float(sigma[i]),
+             'n': int(n[i]), 'mean_t': float(mean_t[i]), 'sxx': float(sum_tt[i] - n[i] * mean_t[i] ** 2), 'last': float(last[i])}
+            for i in range(len(values))]
+
+def project_log_linear(fit, t):
+    """
+    Project a log-linear fit to the given times with a 95% prediction interval.
+    """
+    center = fit['intercept'] + fit['slope'] * t
+    spread = Z_95 * fit['sigma'] * np.sqrt(1 + 1 / max(fit['n'], 1) + (t - fit['mean_t']) ** 2 / max(fit['sxx'], 1e-9))
+    return np.exp(center), np.exp(center - spread), np.exp(center + spread)
+
+def fit_holt(values):
+    """
+    Fit Holt's linear trend model to many equally spaced series at once.
+
+    Every (alpha, beta) pair of HOLT_GRID is run for all series in parallel and
+    the pair with the smallest one-step-ahead squared error is kept per series.
+
+    Args:
+        values (ndarray): Array of shape (series, time) without missing values.
+
+    Returns:
+        list: A dictionary of fitted parameters and final state per series.
+    """
+    grid = np.array(HOLT_GRID)
+    alpha = grid[:, 0][:, None]
+    beta = grid[:, 1][:, None]
+
+    # Shape (grid, series): one state per parameter pair and series
+    level = np.broadcast_to(values[:, 0], (len(grid), len(values))).copy()
+    trend = np.broadcast_to(values[:, 1] - values[:, 0] if values.shape[1] > 1 else np.zeros(len(values)), level.shape).copy()
+    sse = np.zeros(level.shape)
+
+    for step in range(1, values.shape[1]):
+        error = values[:, step] - (level + trend)
+        sse += error ** 2
+        previous_level = level
+        level = alpha * values[:, step] + (1 - alpha) * (level + trend)
+        trend = beta * (level - previous_level) + (1 - beta) * trend
+
+    best = np.argmin(sse, axis=0)
+    series = np.arange(len(values))
+    sigma = np.sqrt(sse[best, series] / max(values.shape[1] - 1, 1))
+    return [{'model': 'holt', 'alpha': float(grid[best[i], 0]), 'beta': float(grid[best[i], 1]),
+             'level': float(level[best[i], i]), 'trend': float(trend[best[i], i]), 'sigma': float(sigma[i])}
+            for i in series]
+
+def project_holt(fit, horizon):
+    """
+    Project a Holt fit over a number of steps with a 95% prediction interval.
+    """
+    steps = np.arange(1, horizon + 1)
+    forecast = fit['level'] + steps * fit['trend']
+    # Variance of the h-step-ahead error of Holt's linear method
+    weights = fit['alpha'] * (1 + np.arange(horizon) * fit['beta'])
+    variance = fit['sigma'] ** 2 * (1 + np.concatenate([[0], np.cumsum(weights[1:] ** 2)]))
+    spread = Z_95 * np.sqrt(variance)
+    return forecast, forecast - spread, forecast + spread
+
+def get_cached_fits(names, values, model, fit_function):
+    """
+    Return fitted parameters per series, refitting only series whose values changed.
+
+    Parameters are cached keyed by series name and a hash of its values, so a run
+    over unchanged data does no fitting and new points only refit the affected series.
+
+    Args:
+        names (list): A unique name per series.
+        values (ndarray): Array of shape (series, time).
+        model (str): The model name, part of the cache key.
+        fit_function (callable): Fits an array of series and returns a list of parameter dictionaries.
+
+    Returns:
+        list: The fitted parameters per series.
+    """
+    file_path = os.path.join(cache.cache_path, params_file)
+    cached = {}
+    if os.path.exists(file_path):
+        with open(file_path, 'r', encoding='utf-8') as file:
+            cached = json.load(file)
+
+    keys = [hashlib.sha256(model.encode('utf-8') + row.tobytes()).hexdigest()[:16] for row in np.ascontiguousarray(values, dtype=float)]
+    stale = [i for i, (name, key) in enumerate(zip(names, keys)) if cached.get(name, {}).get('key') != key]
+
+    if stale:
+        for i, fit in zip(stale, fit_function(values[stale])):
+            cached[names[i]] = {'key': keys[i], 'fit': fit}
+        cache.save_cache_file(file_path, cached)
+
+    return [cached[name]['fit'] for name in names]
+
+@render_cache.cached_figure
+def draw_forecast_graph(monthly_values, forecast, title, ylabel):
+    """
+    Create a line graph of a monthly series followed by its forecast and 95% interval.
+    """
+    months = sorted(monthly_values)
+
+    plt.figure(figsize=(15, 7))
+    plt.plot(months, [monthly_values[month] for month in months], marker='o', linestyle='-', color='#773ee9', label='History')
+    plt.plot(forecast.index, forecast['forecast'], marker='o', linestyle='--', color='grey', label='Forecast')
+    plt.fill_between(forecast.index, forecast['lower'], forecast['upper'], color='grey', alpha=0.2, label='95% interval')
+    plt.xticks(rotation=45)
+    plt.xlabel('Month')
+    plt.ylabel(ylabel)
+    plt.title(title)
+    plt.legend()
+    plt.grid(True, linestyle='--', linewidth=0.5)
+    plt.tight_layout()
+    plt.show()
@@ -2,6 +2,14 @@ import releases
 import themes
 import plugins
 import argparse
+import render_cache
+import dashboard
+import archive
+import cache
+import datasets
+import validation
+import search_index
+import sqlite_export
 
 if __name__ == '__main__':
     # Create an argument parser to handle command-line arguments
@@ -17,6 +25,25 @@ if __name__ == '__main__':
     parser.add_argument('-s', '--save', action='store_true', help='Save fetched data into "saved-data" folder')
     parser.add_argument('-hi', '--history', action='store_true', help='Generate historical graphs')
     parser.add_argument('-l', '--latest', action='store_true', help='Generate graphs with the latest data')
+    parser.add_argument('-fc', '--forecast', action='store_true', help='Generate forecasts of the plugin and theme counts and downloads')
+    parser.add_argument('--accept', action='store_true', help='Save fetched snapshots even if they fail validation')
+    parser.add_argument('--offline', action='store_true', help='Make no network requests and use only saved data and cached downloads')
+    parser.add_argument('-o', '--output', metavar='DIR', help='Write graphs as PNG files into DIR instead of showing them; unchanged graphs are not re-rendered')
+    parser.add_argument('--force', action='store_true', help='Re-render all graphs in output mode even if they are unchanged')
+    parser.add_argument('-d', '--dashboard', metavar='FILE', help='Export an interactive HTML dashboard generated offline from the saved data')
+    parser.add_argument('-db', '--sqlite', metavar='FILE', help='Export the saved snapshots, monthly series and release platform counts into a SQLite database')
+    parser.add_argument('-c', '--columnar', action='store_true', help='Convert saved snapshots into memory-mapped columnar files for faster history loading')
+    parser.add_argument('--sources', metavar='FILE', help='Also track the forks or mirrors of obsidian-releases listed in a JSON file')
+    parser.add_argument('-cr', '--crawl', action='store_true', help='Crawl the GitHub releases of every plugin (resumable)')
+
+    # Subcommand to query the search and ranking index of the saved snapshots
+    subparsers = parser.add_subparsers(dest='command')
+    index_parser = subparsers.add_parser('index', help='Search plugins or themes and query their rankings')
+    index_parser.add_argument('kind', nargs='?', choices=['plugins', 'themes'], default='plugins', help='The dataset to query')
+    index_parser.add_argument('--search', metavar='TEXT', help='Find ids starting with or resembling TEXT')
+    index_parser.add_argument('--top', metavar='K', type=int, help='List the K most downloaded ids')
+    index_parser.add_argument('--date', metavar='YYYY-MM-DD', help='Date of the top list (default: newest snapshot)')
+    index_parser.add_argument('--rank', metavar='ID', help='Show the rank of ID over time')
 
     # Parse the command-line arguments
     args = parser.parse_args()
@@ -29,15 +56,49 @@ if __name__ == '__main__':
         'save': args.save,
         'history': args.history,
         'latest': args.latest,
-        'all' : args.plugins
+        'crawl': args.crawl,
+        'forecast': args.forecast,
+        'all': args.all,
+        'sources': {}
     }
 
-    # Execute functions based on the selected graph types
-    if args.themes or args.all:
-        themes.graph_themes(configuration)
-    if args.plugins or args.all:
-        plugins.graph_plugins(configuration)
-    if args.releases or args.all:
-        releases.graph_releases(configuration)
+    if args.offline:
+        cache.set_offline()
+    if args.accept:
+        validation.set_accept_invalid()
+    if args.output:
+        render_cache.configure(args.output, args.force)
+    if args.sources:
+        targets = datasets.load_targets(args.sources)
+        configuration['sources'] = {
+            'plugins': datasets.create_sources(targets.get('plugins', []), plugins.PluginSource),
+            'themes': datasets.create_sources(targets.get('themes', []), themes.ThemeSource),
+            'releases': datasets.create_sources(targets.get('releases', []), releases.ReleaseSource)
+        }
+
+    if args.command == 'index':
+        index_sources = {'plugins': plugins.source, 'themes': themes.source}
+        search_index.run_query(index_sources[args.kind], args.search, args.top, args.date, args.rank)
+
+    if args.columnar:
+        archive.to_columnar(plugins.source)
+        archive.to_columnar(themes.source)
+
+    # Execute functions based on the selected datasets
+    graphs = {
+        'themes': themes.graph_themes,
+        'plugins': plugins.graph_plugins,
+        'releases': releases.graph_releases
+    }
+    for dataset, graph in graphs.items():
+        if configuration[dataset] or configuration['all']:
+            graph(configuration)
+    if args.dashboard:
+        dashboard.export_dashboard(args.dashboard)
+    if args.sqlite:
+        extra_sources = configuration['sources']
+        sqlite_export.export_database(args.sqlite,
+                                      [plugins.source, themes.source] + extra_sources.get('plugins', []) + extra_sources.get('themes', []),
+                                      [releases.source] + extra_sources.get('releases', []))
 
-        
\ No newline at end of file
+    render_cache.evict_stale()
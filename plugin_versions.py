@@ -0,0 +1,319 @@
+import os
+import re
+import json
+import time
+import threading
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import pandas as pd
+import matplotlib.pyplot as plt
+import requests
+import render_cache
+
+save_path = "saved_plugins"
+checkpoint_file = "plugin_releases_checkpoint.json"
+
+# Keys of a community-plugin-stats.json entry that are not version numbers
+NON_VERSION_KEYS = {'id', 'downloads', 'updated'}
+
+def graph_plugin_versions(data, top_n=5):
+    """
+    Draw the version adoption curves of the top N plugins and the latest version share.
+
+    Args:
+        data (dict): Plugin stats data keyed by plugin id.
+        top_n (int): The number of most downloaded plugins to draw adoption curves for.
+    """
+    version_table = get_version_table(data)
+    if version_table.empty:
+        print("No per-version download counts available.")
+        return
+    latest_share = get_latest_version_share(version_table)
+    draw_version_adoption_graph(get_version_adoption_curves(version_table, latest_share.index[:top_n]))
+    draw_latest_version_share_graph(latest_share)
+
+def save_version_table(data, save_path):
+    """
+    Save per-version download counts to a CSV file with the current date in the filename.
+    """
+    version_table = get_version_table(data)
+    if version_table.empty:
+        print("No per-version download counts to save.")
+        return
+
+    if not os.path.exists(save_path):
+        os.makedirs(save_path)
+
+    current_date = datetime.now().strftime("%Y-%m-%d")
+    file_path = os.path.join(save_path, f'plugin_versions_{current_date}.csv')
+    version_table.to_csv(file_path, index=False, encoding='utf-8')
+    print(f"Plugin version data saved in {file_path}")
+
+def save_crawled_releases(catalog, headers, save_path):
+    """
+    Crawl the GitHub releases of all plugins and save them to a CSV file.
+    """
+    releases = crawl_plugin_releases(catalog, headers, checkpoint_path=os.path.join(save_path, checkpoint_file))
+    current_date = datetime.now().strftime("%Y-%m-%d")
+    file_path = os.path.join(save_path, f'plugin_releases_{current_date}.csv')
+    releases.to_csv(file_path, index=False, encoding='utf-8')
+    print(f"Plugin release data saved in {file_path}")
+
+def get_version_table(data):
+    """
+    Extract per-version download counts from plugin stats into a tidy table.
+
+    Args:
+        data (dict): Plugin stats data keyed by plugin id.
+
+    Returns:
+        DataFrame: One row per (plugin, version) with the version's download count.
+    """
+    rows = []
+    for plugin, values in data.items():
+        for key, downloads in values.items():
+            if key in NON_VERSION_KEYS or not isinstance(downloads, (int, float)):
+                continue
+            rows.append((plugin, key, int(downloads)))
+
+    df = pd.DataFrame(rows, columns=['plugin', 'version', 'downloads'])
+    df['version_key'] = df['version'].map(version_sort_key)
+    df.sort_values(by=['plugin', 'version_key'], inplace=True)
+    df['order'] = df.groupby('plugin').cumcount()
+    return df.drop(columns='version_key').reset_index(drop=True)
+
+def version_sort_key(version):
+    """
+    Return a sortable key for a version string such as "1.10.2" or "v2.0.0-beta.1".
+    """
+    numbers = tuple(int(part) for part in re.findall(r'\d+', version.split('-')[0])[:4])
+    # Pre-releases sort before the matching final release
+    return numbers + ((0,) if '-' in version else (1,))
+
+def get_latest_version_share(version_table):
+    """
+    Calculate the share of each plugin's downloads that went to its latest version.
+
+    Args:
+        version_table (DataFrame): The tidy table from get_version_table.
+
+    Returns:
+        DataFrame: Latest version, its downloads, total downloads and share (0-1) per plugin.
+    """
+    grouped = version_table.groupby('plugin')
+    latest = version_table.loc[grouped['order'].idxmax(), ['plugin', 'version', 'downloads']].set_index('plugin')
+    latest.columns = ['latest_version', 'latest_downloads']
+    latest['total_downloads'] = grouped['downloads'].sum()
+    latest['latest_share'] = latest['latest_downloads'] / latest['total_downloads'].where(latest['total_downloads'] > 0)
+    return latest.sort_values(by='total_downloads', ascending=False)
+
+def get_version_adoption_curves(version_table, plugins):
+    """
+    Calculate the cumulative share of downloads across successive versions of plugins.
+
+    Args:
+        version_table (DataFrame): The tidy table from get_version_table.
+        plugins (list): The plugin ids to calculate curves for.
+
+    Returns:
+        dict: Plugin id mapped to a DataFrame of version and cumulative share.
+    """
+    curves = {}
+    selected = version_table[version_table['plugin'].isin(plugins)]
+    for plugin, group in selected.groupby('plugin'):
+        cumulative = group['downloads'].cumsum()
+        total = cumulative.iloc[-1]
+        curves[plugin] = pd.DataFrame({
+            'version': group['version'].values,
+            'cumulative_share': (cumulative / total).values if total else 0.0
+        })
+    return curves
+
+def crawl_plugin_releases(catalog, headers, max_workers=8, checkpoint_path=None):
+    """
+    Fetch the GitHub releases of every plugin repository with a bounded worker pool.
+
+    Progress is checkpointed to disk, so an interrupted crawl resumes with the
+    plugins that are still missing. The checkpoint is removed once every plugin
+    was crawled, so the next crawl starts over with current counts. Workers
+    pause together when the GitHub rate limit is exhausted.
+
+    Args:
+        catalog (list): Entries of community-plugins.json (must contain 'id' and 'repo').
+        headers (dict): HTTP headers for authentication.
+        max_workers (int): The number of concurrent requests.
+        checkpoint_path (str): The file used to checkpoint results.
+
+    Returns:
+        DataFrame: One row per (plugin, release asset) with tag, publish date and download count.
+    """
+    if checkpoint_path is None:
+        checkpoint_path = os.path.join(save_path, checkpoint_file)
+
+    results = load_checkpoint(checkpoint_path)
+    pending = [entry for entry in catalog if entry.get('repo') and entry['id'] not in results]
+    print(f"Crawling releases for {len(pending)} plugins ({len(results)} already checkpointed).")
+
+    limiter = RateLimiter()
+    lock = threading.Lock()
+    completed = 0
+    failed = 0
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(get_repo_releases, entry['repo'], headers, limiter): entry['id'] for entry in pending}
+        for future in as_completed(futures):
+            plugin = futures[future]
+            try:
+                releases = future.result()
+            except Exception as e:
+                print(f"Error crawling {plugin}: {e}")
+                failed += 1
+                continue
+            with lock:
+                results[plugin] = releases
+                completed += 1
+                # Checkpoint regularly so a crash loses at most a few requests
+                if completed % 50 == 0:
+                    save_checkpoint(checkpoint_path, results)
+
+    if failed:
+        # Keep the checkpoint, so the next crawl only retries the failed plugins
+        save_checkpoint(checkpoint_path, results)
+        print(f"{failed} plugins could not be crawled. Run the crawl again to resume.")
+    elif os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+    return releases_to_table(results)
+
+def get_repo_releases(repo, headers, limiter):
+    """
+    Fetch all releases of a repository, following pagination.
+
+    Args:
+        repo (str): The repository in "owner/name" form.
+        headers (dict): HTTP headers for authentication.
+        limiter (RateLimiter): The shared rate limiter.
+
+    Returns:
+        list: Releases reduced to tag, publish date and asset download counts.
+    """
+    url = f"https://api.github.com/repos/{repo}/releases?per_page=100"
+    releases = []
+    while url:
+        response = limiter.get(url, headers)
+        if response.status_code == 404:
+            return releases
+        if response.status_code != 200:
+            raise Exception(f"Status code {response.status_code} for {url}")
+        for release in response.json():
+            releases.append({
+                'tag_name': release['tag_name'],
+                'published_at': release['published_at'],
+                'assets': {asset['name']: asset['download_count'] for asset in release['assets']}
+            })
+        url = response.links['next']['url'] if 'next' in response.links else None
+    return releases
+
+class RateLimiter:
+    """
+    Share GitHub rate limit state between worker threads.
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.resume_at = 0
+
+    def get(self, url, headers, retries=3):
+        """
+        Perform a GET request, waiting whenever the rate limit is exhausted.
+        """
+        for _ in range(retries):
+            self.wait()
+            response = requests.get(url, headers=headers)
+            remaining = response.headers.get('X-RateLimit-Remaining')
+            reset = response.headers.get('X-RateLimit-Reset')
+
+            if response.status_code in (403, 429) and (remaining == '0' or 'Retry-After' in response.headers):
+                retry_after = response.headers.get('Retry-After')
+                resume_at = time.time() + int(retry_after) if retry_after else int(reset or time.time() + 60)
+                self.pause_until(resume_at)
+                continue
+
+            if remaining == '0' and reset:
+                self.pause_until(int(reset))
+            return response
+        return response
+
+    def wait(self):
+        with self.lock:
+            delay = self.resume_at - time.time()
+        if delay > 0:
+            time.sleep(delay)
+
+    def pause_until(self, resume_at):
+        with self.lock:
+            if resume_at > self.resume_at:
+                print(f"GitHub rate limit reached. Pausing for {resume_at - time.time():.0f} seconds.")
+                self.resume_at = resume_at
+
+def load_checkpoint(checkpoint_path):
+    """
+    Load crawled releases from a checkpoint file, if one exists.
+    """
+    if not os.path.exists(checkpoint_path):
+        return {}
+    with open(checkpoint_path, 'r', encoding='utf-8') as file:
+        return json.load(file)
+
+def save_checkpoint(checkpoint_path, results):
+    """
+    Save crawled releases to a checkpoint file atomically.
+    """
+    directory = os.path.dirname(checkpoint_path)
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory)
+    temp_path = f"{checkpoint_path}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as file:
+        json.dump(results, file)
+    os.replace(temp_path, checkpoint_path)
+
+def releases_to_table(results):
+    """
+    Flatten crawled releases into a tidy table.
+    """
+    rows = []
+    for plugin, releases in results.items():
+        for release in releases:
+            for asset, downloads in release['assets'].items():
+                rows.append((plugin, release['tag_name'], release['published_at'], asset, downloads))
+    return pd.DataFrame(rows, columns=['plugin', 'version', 'published_at', 'asset', 'downloads'])
+
+@render_cache.cached_figure
+def draw_version_adoption_graph(curves):
+    """
+    Create a line graph of the cumulative download share across versions for each plugin.
+    """
+    plt.figure(figsize=(15, 7))
+    for plugin, curve in curves.items():
+        plt.plot(range(1, len(curve) + 1), curve['cumulative_share'] * 100, marker='.', linestyle='-', label=plugin)
+
+    plt.xlabel('Release (oldest to newest)')
+    plt.ylabel('Cumulative share of downloads (%)')
+    plt.title('Version Adoption Curves')
+    plt.legend()
+    plt.grid(True, linestyle='--', linewidth=0.5)
+    plt.tight_layout()
+    plt.show()
+
+@render_cache.cached_figure
+def draw_latest_version_share_graph(latest_share):
+    """
+    Create a histogram of the share of downloads going to each plugin's latest version.
+    """
+    shares = latest_share['latest_share'].dropna() * 100
+
+    plt.figure(figsize=(12, 6))
+    plt.hist(shares, bins=50, edgecolor='black', color='#773ee9', alpha=0.7)
+    plt.xlabel('Downloads of the latest version (%)')
+    plt.ylabel('Number of Plugins')
+    plt.title(f'Latest Version Share (Median: {shares.median():.1f}%)')
+    plt.tight_layout()
+    plt.show()
@@ -1,310 +1,255 @@
 import pandas as pd
 import os
-import csv
-import datetime
+import re
+import json
+import hashlib
 from datetime import datetime
 import seaborn as sns
 import matplotlib.pyplot as plt
-import requests
-import json
-import numpy as np
-from matplotlib.colors import LinearSegmentedColormap, to_rgb
+import cache
+import forecast
+import validation
+import datasets
+import plugin_versions
+import render_cache
+from datasets import generate_gradient_colors
 
 save_path = "saved_plugins"
-def graph_plugins(configuration):
+
+class PluginSource(datasets.DatasetSource):
     """
-    Main function to graph plugins based on the provided configuration.
+    Plugin download stats from community-plugin-stats.json.
     """
-
-    # Define the URL for the GitHub commit history and headers for authentication.
-    commit_history_url = "https://api.github.com/repos/obsidianmd/obsidian-releases/commits?path=community-plugin-stats.json"
-    headers = {
-        "Authorization": "Insert your Github token her. You can generate one here https://github.com/settings/tokens"
+    name = "plugins"
+    save_path = save_path
+    count_key = "downloads"
+    count_column = "Downloads"
+    history_path = "community-plugin-stats.json"
+    monthly_files = {
+        'counts': "monthly_plugin_counts.json",
+        'downloads': "monthly_plugin_downloads.json"
     }
+    cumulative_metrics = {'downloads'}
+    catalog_key = "id"
 
-    # Retrieve plugin data from GitHub and local JSON file.
-    monthly_plugin_counts, monthly_downloads = get_plugin_data_from_github(commit_history_url, headers)
-    data = get_plugin_stats_from_url("https://raw.githubusercontent.com/obsidianmd/obsidian-releases/master/community-plugin-stats.json")
-    
-    url = "https://raw.githubusercontent.com/obsidianmd/obsidian-releases/master/community-plugins.json"
-
-
-    if configuration["themes"] or ["all"]:
-        if configuration["save"]:
-            # -p -s
-            save_data(data, save_path)
-            save_monthly_downloads_to_file(monthly_downloads)
-            save_monthly_plugin_counts_to_file(monthly_plugin_counts)
-        if configuration["latest"]:
-            # -p -l
-            draw_download_distribution_graph(data)
-            draw_plugin_kde(data)
-
-
-        if configuration["history"]:
-            # -p -hi
-            draw_download_history_graph(monthly_downloads)
-            draw_monthly_plugin_counts_graph(monthly_plugin_counts)
-            draw_plugin_growth_graph(monthly_plugin_counts)
-            draw_combined_stats_graph(monthly_plugin_counts, monthly_downloads)
-        if  not any([configuration["save"], configuration["latest"], configuration["history"]]):
-            # -p or -all
-            save_data(data, save_path)
-            save_monthly_downloads_to_file(monthly_downloads)
-            save_monthly_plugin_counts_to_file(monthly_plugin_counts)
-            draw_download_history_graph(monthly_downloads)
-            draw_monthly_plugin_counts_graph(monthly_plugin_counts)
-            draw_plugin_growth_graph(monthly_plugin_counts)
-            draw_combined_stats_graph(monthly_plugin_counts, monthly_downloads)
-            draw_download_distribution_graph(data)
-            draw_plugin_kde(data)
-    
+    @property
+    def stats_url(self):
+        return self.get_raw_url(self.history_path)
 
-# Function to retrieve plugin data from GitHub and process it.
-def get_plugin_data_from_github(commit_history_url, headers):
-    def get_all_commits(url, headers):
-        """
-        Retrieve all commits related to a specific URL from GitHub.
-        
-        Args:
-            url (str): The URL to retrieve commits from.
-            headers (dict): HTTP headers for authentication.
-
-        Returns:
-            list: A list of commit objects.
-        """
-        all_commits = []
-        while url:
-            response = requests.get(url, headers=headers)
-            if response.status_code != 200:
-                return None
-            commits = response.json()
-            all_commits.extend(commits)
-            url = response.links['next']['url'] if 'next' in response.links else None
-        return all_commits
-
-    def process_commits(commits):
-        """
-        Process the retrieved commits to extract monthly plugin counts and downloads.
-
-        Args:
-            commits (list): A list of commit objects.
-
-        Returns:
-            dict: Monthly plugin counts and monthly downloads as dictionaries.
-        """
-        monthly_commits = {}
-        for commit in commits:
-            date = commit["commit"]["committer"]["date"]
-            month_year = date[:7]  # Format: YYYY-MM
-            if month_year not in monthly_commits:
-                monthly_commits[month_year] = commit["sha"]
-        
-        monthly_plugin_counts = {}
-        monthly_downloads = {}
-        for month_year, commit_sha in monthly_commits.items():
-            file_url = f"https://raw.githubusercontent.com/obsidianmd/obsidian-releases/{commit_sha}/community-plugin-stats.json"
-            response = requests.get(file_url)
-            data = response.json()
-            plugin_count = len(data)
-            total_downloads = sum(plugin.get('downloads', 0) for plugin in data.values())
-            monthly_plugin_counts[month_year] = plugin_count
-            monthly_downloads[month_year] = total_downloads
-        
-        return monthly_plugin_counts, monthly_downloads
-
-    try:
-        commits = get_all_commits(commit_history_url, headers)
-        if commits is None:
-            raise Exception("Error fetching commit history. Due to rate limit or missing GitHub token. Using local JSON data instead.")
-        return process_commits(commits)
-    except Exception as e:
-        print("Error:", str(e))
-        try:
-            with open(f'{save_path}/monthly_plugin_downloads.json', 'r') as file:
-                monthly_downloads = json.load(file)
-            with open(f'{save_path}/monthly_plugin_counts.json', 'r') as file:
-                monthly_plugin_counts = json.load(file)
-            return monthly_plugin_counts, monthly_downloads
-        except FileNotFoundError as e:
-            print("File not found:", str(e))
-            return None, None
-
-
-def get_plugin_stats_from_url(url):
-    """
-    Fetch plugin stats data from a given URL and return it as a dictionary.
+    @property
+    def catalog_url(self):
+        return self.get_raw_url("community-plugins.json")
 
-    Args:
-        url (str): The URL to retrieve plugin stats data from.
+    def validate_history_snapshot(self, data):
+        return validation.validate_stats_snapshot(data, 'downloads')
 
-    Returns: A dictionary containing the retrieved plugin stats data.
-    """ 
-    response = requests.get(url)
-    if response.status_code != 200:
-        print(f"Error fetching data from {url}. Status code: {response.status_code}")
-        return {}
+    def summarize_history_snapshot(self, data):
+        return {
+            'counts': len(data),
+            'downloads': sum(plugin.get('downloads', 0) for plugin in data.values())
+        }
 
-    data = response.json()
-    return data
+source = PluginSource()
 
-def save_data(data, save_path):
-    # Remove the 'id' key and sort by download count
-    sorted_data = {plugin: {'downloads': values['downloads']} for plugin, values in sorted(data.items(), key=lambda item: item[1]['downloads'], reverse=True)}
-
-    # Ensure that the save_path directory exists
-    if not os.path.exists(save_path):
-        os.makedirs(save_path)
+def graph_plugins(configuration):
+    """
+    Main function to graph plugins based on the provided configuration.
+    """
+    # Update the monthly history and fetch the latest plugin stats of every configured repository in parallel.
+    extra_sources = configuration.get("sources", {}).get("plugins", [])
+    results = datasets.fetch_all([source] + extra_sources)
+    data, history = results[0]
+    monthly_plugin_counts = history.get('counts', {})
+    monthly_downloads = history.get('downloads', {})
+
+    if configuration["save"] or not any([configuration["latest"], configuration["history"], configuration["crawl"], configuration["forecast"]]):
+        # Other repositories are only saved, the charts use the default repository
+        for extra_source, (extra_data, extra_history) in zip(extra_sources, results[1:]):
+            extra_source.persist(extra_data, extra_history)
+    if configuration["save"]:
+        # -p -s
+        source.persist(data, history)
+        # Data served from saved or outdated cached copies is not saved again
+        if not source.fallback:
+            load_enriched_data(data, source.catalog_url, save_path)
+            plugin_versions.save_version_table(data, save_path)
+    if configuration["latest"]:
+        # -p -l
+        draw_download_distribution_graph(data)
+        draw_plugin_kde(data)
+        enriched_data = load_enriched_data(data, source.catalog_url, save_path, save=not source.fallback)
+        draw_author_downloads_graph(aggregate_downloads_by_author(enriched_data))
+        draw_owner_downloads_graph(aggregate_downloads_by_owner(enriched_data))
+        plugin_versions.graph_plugin_versions(data)
+    if configuration["history"]:
+        # -p -hi
+        draw_history_graphs(monthly_plugin_counts, monthly_downloads)
+        draw_source_comparison_graphs(extra_sources, results)
+    if not any([configuration["save"], configuration["latest"], configuration["history"], configuration["crawl"], configuration["forecast"]]):
+        # -p or -all
+        source.persist(data, history)
+        if not source.fallback:
+            plugin_versions.save_version_table(data, save_path)
+        draw_history_graphs(monthly_plugin_counts, monthly_downloads)
+        draw_source_comparison_graphs(extra_sources, results)
+        draw_download_distribution_graph(data)
+        draw_plugin_kde(data)
+        enriched_data = load_enriched_data(data, source.catalog_url, save_path, save=not source.fallback)
+        draw_author_downloads_graph(aggregate_downloads_by_author(enriched_data))
+        draw_owner_downloads_graph(aggregate_downloads_by_owner(enriched_data))
+        plugin_versions.graph_plugin_versions(data)
+    if configuration["forecast"]:
+        # -p -fc
+        draw_forecast_graphs(monthly_plugin_counts, monthly_downloads)
+        forecast.save_item_forecasts(source)
+    if configuration["crawl"]:
+        # -p -cr
+        if cache.offline:
+            print("Crawling plugin releases is not possible in offline mode.")
+        else:
+            catalog = cache.get_cached_json(source.catalog_url) or []
+            plugin_versions.save_crawled_releases(catalog, datasets.headers, save_path)
+
+def draw_history_graphs(monthly_plugin_counts, monthly_downloads):
+    """
+    Draw all graphs of the monthly plugin history.
+    """
+    datasets.draw_monthly_graph(monthly_downloads, 'Monthly Download Counts (values in millions)', 'Downloads (in millions)', scale=1_000_000)
+    datasets.draw_monthly_graph(monthly_plugin_counts, 'Monthly Plugin Counts', 'Plugin Counts')
+    datasets.draw_growth_graph(monthly_plugin_counts, 'Monthly Plugin Growth Rate')
+    draw_combined_stats_graph(monthly_plugin_counts, monthly_downloads)
 
-    # Get the current date for the file name
-    current_date = datetime.now().strftime("%Y-%m-%d")
-    file_path = os.path.join(save_path, f'plugins_{current_date}.csv')
+def draw_source_comparison_graphs(extra_sources, results):
+    """
+    Draw the monthly plugin history of every configured repository side by side.
+    """
+    if not extra_sources:
+        return
+    labels = [source.label] + [extra_source.label for extra_source in extra_sources]
+    histories = [history for _, history in results]
+    datasets.draw_source_comparison_graph({label: history.get('counts', {}) for label, history in zip(labels, histories)}, 'Monthly Plugin Counts by Repository', 'Plugin Counts')
+    datasets.draw_source_comparison_graph({label: history.get('downloads', {}) for label, history in zip(labels, histories)}, 'Monthly Download Counts by Repository', 'Downloads')
 
-    # Write data to a CSV file
-    with open(file_path, mode='w', newline='', encoding='utf-8') as file:
-        writer = csv.writer(file)
-        writer.writerow(['Name', 'Downloads'])  # Write the header
-        for plugin, values in sorted_data.items():
-            writer.writerow([plugin, values['downloads']])
+def draw_forecast_graphs(monthly_plugin_counts, monthly_downloads):
+    """
+    Draw the forecasts of the monthly plugin counts and downloads.
+    """
+    forecast.draw_forecast_graph(monthly_plugin_counts, forecast.forecast_monthly(monthly_plugin_counts, name='plugins:counts'), 'Plugin Count Forecast', 'Plugin Counts')
+    forecast.draw_forecast_graph(monthly_downloads, forecast.forecast_monthly(monthly_downloads, name='plugins:downloads'), 'Plugin Download Forecast', 'Downloads')
 
-    print(f"Latest Data saved in {file_path}")
-    
-def generate_gradient_colors(base_color_hex, num_colors):
+def load_enriched_data(data, catalog_url, save_path, save=True):
     """
-    Generate a gradient of colors starting from a base color in hexadecimal format.
+    Join plugin stats with the community plugin catalog (author, repo, description).
+
+    The joined table is materialized once per snapshot and saved next to the
+    plugin CSVs, so repeated reports reuse it instead of downloading and joining
+    the catalog again. The file name holds the current date and a hash of the
+    download counts, so a table is never reused for different data.
 
     Args:
-        base_color_hex (str): The base color in hexadecimal format (e.g., "#RRGGBB").
-        num_colors (int): The number of gradient colors to generate.
+        data (dict): Plugin stats data keyed by plugin id.
+        catalog_url (str): The URL of community-plugins.json.
+        save_path (str): The directory the joined table is stored in.
+        save (bool): Whether a newly joined table is saved. Data served from saved or
+            outdated cached copies is joined without being saved.
 
     Returns:
-        list: A list of RGB colors forming the gradient.
+        DataFrame: One row per plugin with id, name, author, owner, repo, description and downloads.
     """
-    # Convert the hexadecimal base color code to RGB
-    base_color_rgb = np.array(to_rgb(base_color_hex))
-
-    # Create a slightly lighter version of the base color for the beginning of the gradient
-    light_color = base_color_rgb + (1 - base_color_rgb) * 0.5  # Slightly lighten
-    light_color = np.clip(light_color, 0, 1)  # Ensure values are within a valid range
-
-    # Create a gradient from the lighter version of the base color (start) to the base color (end)
-    cmap = LinearSegmentedColormap.from_list('custom_gradient', [light_color, base_color_rgb], N=num_colors)
-    # Generate color values from the gradient, reversing the order
-    colors = cmap(np.linspace(0, 1, num_colors))[::-1]
-    return colors
-    
-def save_monthly_downloads_to_file(monthly_downloads, file_format="json"):
+    current_date = datetime.now().strftime("%Y-%m-%d")
+    counts = sorted((plugin, values.get('downloads', 0)) for plugin, values in data.items())
+    data_hash = hashlib.sha256(json.dumps(counts).encode('utf-8')).hexdigest()[:12]
+    file_name = f'plugins_enriched_{current_date}_{data_hash}.csv'
+    file_path = os.path.join(save_path, file_name)
+
+    # Reuse the joined table if this snapshot was already materialized
+    if os.path.exists(file_path):
+        return pd.read_csv(file_path, keep_default_na=False)
+
+    catalog = cache.get_cached_json(catalog_url)
+    if catalog is None:
+        # Without the catalog the table has no metadata, so it is not materialized
+        return join_plugin_metadata(data, [])
+    df = join_plugin_metadata(data, catalog)
+    if not save:
+        return df
+
+    if not os.path.exists(save_path):
+        os.makedirs(save_path)
+    # Replace the table of an earlier fetch of the same day
+    pattern = re.compile(rf'plugins_enriched_{current_date}(_[0-9a-f]+)?\.csv')
+    for f in os.listdir(save_path):
+        if pattern.fullmatch(f) and f != file_name:
+            os.remove(os.path.join(save_path, f))
+    df.to_csv(file_path, index=False, encoding='utf-8')
+    print(f"Enriched plugin data saved in {file_path}")
+    return df
+
+def join_plugin_metadata(data, catalog):
     """
-    Save monthly download counts to a file in JSON or CSV format.
+    Join plugin stats with catalog entries using an index on the plugin id.
 
     Args:
-        monthly_downloads (dict): A dictionary containing monthly download counts.
-        file_format (str): The desired file format ("json" or "csv").
+        data (dict): Plugin stats data keyed by plugin id.
+        catalog (list): Entries of community-plugins.json.
 
     Returns:
-        None
+        DataFrame: The joined table sorted by downloads.
     """
-    # Define the filename based on the specified file format.
-    filename = os.path.join(save_path, f"monthly_plugin_downloads.{file_format}")
-
-    if file_format == "json":
-        # Save data in JSON format.
-        with open(filename, "w") as f:
-            json.dump(monthly_downloads, f, indent=4)
-    elif file_format == "csv":
-        # Save data in CSV format.
-        with open(filename, "w") as f:
-            f.write("Month,Downloads\n")  # Write the CSV header.
-            for month, downloads in monthly_downloads.items():
-                f.write(f"{month},{downloads}\n")  # Write CSV rows.
-    else:
-        # Handle invalid file format.
-        print(f"Invalid file format: {file_format}")
-        return
-
-    print(f"Monthly download counts saved in {filename}.")
-
-def save_monthly_plugin_counts_to_file(monthly_plugin_counts, file_format="json"):
+    # Index the catalog once so every lookup is a dictionary access
+    catalog_index = {entry['id']: entry for entry in catalog if 'id' in entry}
+
+    rows = []
+    for plugin, values in data.items():
+        entry = catalog_index.get(plugin, {})
+        repo = entry.get('repo', '')
+        rows.append({
+            'id': plugin,
+            'name': entry.get('name', plugin),
+            'author': entry.get('author', ''),
+            'owner': repo.split('/')[0] if repo else '',
+            'repo': repo,
+            'description': entry.get('description', ''),
+            'downloads': values.get('downloads', 0)
+        })
+
+    df = pd.DataFrame(rows, columns=['id', 'name', 'author', 'owner', 'repo', 'description', 'downloads'])
+    df.sort_values(by='downloads', ascending=False, inplace=True)
+    return df
+
+def aggregate_downloads_by_author(enriched_data):
     """
-    Save monthly plugin counts to a file in JSON or CSV format.
+    Aggregate plugin counts and downloads per author.
 
     Args:
-        monthly_plugin_counts (dict): A dictionary containing monthly plugin counts.
-        file_format (str): The desired file format ("json" or "csv").
+        enriched_data (DataFrame): The joined table from load_enriched_data.
 
     Returns:
-        None
+        DataFrame: Plugin count and total downloads per author, sorted by downloads.
     """
-    
-    # Define the filename based on the specified file format.
-    filename = os.path.join(save_path, f"monthly_plugin_counts.{file_format}")
-
-    if file_format == "json":
-        # Save data in JSON format.
-        with open(filename, "w") as f:
-            json.dump(monthly_plugin_counts, f, indent=4)
-    elif file_format == "csv":
-        # Save data in CSV format.
-        with open(filename, "w") as f:
-            f.write("Month,Plugin Count\n")  # Write the CSV header.
-            for month, count in monthly_plugin_counts.items():
-                f.write(f"{month},{count}\n")  # Write CSV rows.
-    else:
-        # Handle invalid file format.
-        print(f"Invalid file format: {file_format}")
-        return
+    return aggregate_downloads_by(enriched_data, 'author')
 
-    print(f"Monthly plugin counts saved in {filename}.")
-
-def draw_download_history_graph(monthly_downloads):
-    """
-    Create a bar chart of monthly download counts with gradient colors.
+def aggregate_downloads_by_owner(enriched_data):
     """
-    # Sort the data to display the oldest data first.
-    sorted_data = sorted(monthly_downloads.items(), key=lambda x: x[0])
-
-    # Extract months and download counts.
-    months = [item[0] for item in sorted_data]
-    downloads = [item[1] for item in sorted_data]
-
-    # Create a bar chart.
-    plt.figure(figsize=(15, 7))
-    colors = generate_gradient_colors('#773ee9', len(months))[::-1]  # Generate gradient colors.
-    plt.bar(months, [x/1_000_000 for x in downloads], color=colors)  # Convert downloads to millions for readability.
-    plt.xticks(rotation=45)
-    plt.xlabel('Month')
-    plt.ylabel('Downloads (in millions)')
-    plt.title('Monthly Download Counts (values in millions)')
-    plt.tight_layout()
-    
-    plt.show()
+    Aggregate plugin counts and downloads per GitHub repository owner.
+
+    Args:
+        enriched_data (DataFrame): The joined table from load_enriched_data.
 
-def draw_monthly_plugin_counts_graph(monthly_plugin_counts):
+    Returns:
+        DataFrame: Plugin count and total downloads per owner, sorted by downloads.
     """
-    Create a bar chart of monthly plugin counts.
+    return aggregate_downloads_by(enriched_data, 'owner')
 
-    This function sorts the data so that the oldest data is displayed first.
-    It extracts months and plugin counts from the input dictionary,
-    then creates a bar chart with gradient colors for visual appeal.
+def aggregate_downloads_by(enriched_data, column):
     """
-    # Sort the data to display the oldest data first.
-    sorted_data = sorted(monthly_plugin_counts.items(), key=lambda x: x[0])
-
-    # Extract months and plugin counts.
-    months = [item[0] for item in sorted_data]
-    counts = [item[1] for item in sorted_data]
-
-    # Create a bar chart.
-    plt.figure(figsize=(15, 7))
-    colors = generate_gradient_colors('#773ee9', len(months))[::-1]  # Generate gradient colors.
-    plt.bar(months, counts, color=colors)
-    plt.xticks(rotation=45)
-    plt.xlabel('Month')
-    plt.ylabel('Plugin Counts')
-    plt.title('Monthly Plugin Counts')
-    plt.tight_layout()
-    plt.show()
+    Group the joined table by a column and sum plugin counts and downloads.
+    """
+    known = enriched_data[enriched_data[column] != '']
+    grouped = known.groupby(column).agg(plugins=('id', 'count'), downloads=('downloads', 'sum'))
+    return grouped.sort_values(by='downloads', ascending=False)
 
+@render_cache.cached_figure
 def draw_download_distribution_graph(data):
     """
     Create a line plot of the percentage of downloads for the top N plugins.
@@ -344,37 +289,7 @@ def draw_download_distribution_graph(data):
     plt.tight_layout()
     plt.show()
 
-def draw_plugin_growth_graph(monthly_plugin_counts):
-    """
-    Draw a line graph showing the growth rate of plugins over time.
-    """
-    # Sort the months in ascending order
-    months = sorted(monthly_plugin_counts.keys())
-    counts = [monthly_plugin_counts[month] for month in months]
-    
-    # Calculate growth rates (in percentage), starting from the second month
-    growth_rates = []
-    for i in range(2, len(counts)):
-        growth_rate = ((counts[i] - counts[i-1]) / counts[i-1]) * 100
-        growth_rates.append(max(growth_rate, 0))
-    
-    # Create the growth rate graph
-    plt.figure(figsize=(15, 7))
-    plt.plot(months[2:], growth_rates, marker='o', linestyle='-', color='#773ee9')  # Starts from the second month
-    
-    # Rotate months on the x-axis for better readability
-    plt.xticks(rotation=45)
-    
-    # Set axis labels and title
-    plt.xlabel('Month')
-    plt.ylabel('Growth Rate (%)')
-    plt.title('Monthly Plugin Growth Rate')
-    
-    # Adjust layout and display grid lines
-    plt.tight_layout()
-    plt.grid(True, which='both', linestyle='--', linewidth=0.5)
-    plt.show()
-
+@render_cache.cached_figure
 def draw_combined_stats_graph(monthly_plugin_counts, monthly_downloads):
     """
     Create a line graph showing the monthly plugin counts, monthly downloads, and total downloads.
@@ -421,6 +336,7 @@ def draw_combined_stats_graph(monthly_plugin_counts, monthly_downloads):
 
 
 
+@render_cache.cached_figure
 def draw_plugin_kde(data):
 
     """
@@ -446,4 +362,34 @@ def draw_plugin_kde(data):
     plt.ylabel("Density")
     plt.show()
 
+@render_cache.cached_figure
+def draw_author_downloads_graph(author_stats, top_n=20):
+    """
+    Create a horizontal bar chart of the authors with the most plugin downloads.
+    """
+    top_authors = author_stats.head(top_n)[::-1]
+
+    plt.figure(figsize=(10, 8))
+    colors = generate_gradient_colors('#773ee9', len(top_authors))
+    plt.barh(top_authors.index, top_authors['downloads'] / 1_000_000, color=colors)
+    plt.xlabel('Downloads (in millions)')
+    plt.ylabel('Author')
+    plt.title(f'Top {top_n} Authors by Plugin Downloads')
+    plt.tight_layout()
+    plt.show()
 
+@render_cache.cached_figure
+def draw_owner_downloads_graph(owner_stats, top_n=20):
+    """
+    Create a horizontal bar chart of the GitHub repository owners with the most plugin downloads.
+    """
+    top_owners = owner_stats.head(top_n)[::-1]
+
+    plt.figure(figsize=(10, 8))
+    colors = generate_gradient_colors('#773ee9', len(top_owners))
+    plt.barh(top_owners.index, top_owners['downloads'] / 1_000_000, color=colors)
+    plt.xlabel('Downloads (in millions)')
+    plt.ylabel('Repository Owner')
+    plt.title(f'Top {top_n} Repository Owners by Plugin Downloads')
+    plt.tight_layout()
+    plt.show()
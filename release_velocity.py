@@ -0,0 +1,188 @@
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plt
+import render_cache
+
+PLATFORMS = ['Linux', 'Windows', 'MacOS']
+
+def graph_release_velocity(snapshots, top_n=10):
+    """
+    Draw download velocity, adoption half-life and platform mix graphs from the saved release snapshots.
+
+    Args:
+        snapshots (dict): The snapshots from load_release_snapshots.
+        top_n (int): The number of most recent releases to show.
+    """
+    if len(snapshots['dates']) < 2:
+        print("At least two saved release snapshots are needed to calculate download velocity.")
+        return
+
+    draw_release_velocity_graph(snapshots, top_n)
+    draw_adoption_half_life_graph(snapshots, top_n)
+    draw_platform_mix_graph(snapshots)
+
+def load_release_snapshots(dated_frames):
+    """
+    Combine saved release snapshots into a (version x date x platform) array.
+
+    Args:
+        dated_frames (list): Tuples of snapshot date (YYYY-MM-DD) and release DataFrame, in date order.
+
+    Returns:
+        dict: 'versions', 'published_at' and 'dates' arrays plus the cumulative download
+        'counts' array of shape (versions, dates, platforms). Releases missing from a
+        snapshot are NaN.
+    """
+    frames = [frame for _, frame in dated_frames]
+    dates = np.array([date for date, _ in dated_frames], dtype='datetime64[D]')
+
+    if not frames:
+        return {'versions': np.array([]), 'published_at': np.array([], dtype='datetime64[D]'),
+                'dates': dates, 'counts': np.empty((0, 0, len(PLATFORMS)))}
+
+    # Index every version once, then scatter each snapshot into its column
+    published = pd.concat(frames).drop_duplicates('version', keep='last').set_index('version')['published_at']
+    published = published.sort_values(kind='stable')
+    versions = published.index.to_numpy()
+    version_index = pd.Index(versions)
+
+    counts = np.full((len(versions), len(dates), len(PLATFORMS)), np.nan)
+    for column, frame in enumerate(frames):
+        rows = version_index.get_indexer(frame['version'])
+        counts[rows, column, :] = frame[PLATFORMS].to_numpy(dtype=float)
+
+    return {
+        'versions': versions,
+        'published_at': published.to_numpy(dtype='datetime64[D]'),
+        'dates': dates,
+        'counts': counts
+    }
+
+def get_downloads_per_day(snapshots):
+    """
+    Calculate the downloads per day of each release and platform between consecutive snapshots.
+
+    Args:
+        snapshots (dict): The snapshots from load_release_snapshots.
+
+    Returns:
+        ndarray: Array of shape (versions, dates - 1, platforms). Entry j covers the
+        interval ending at dates[j + 1].
+    """
+    days = np.diff(snapshots['dates']).astype(float)
+    return np.diff(snapshots['counts'], axis=1) / days[None, :, None]
+
+def sum_platforms(counts):
+    """
+    Sum an array over its platform axis, keeping NaN where a release is missing.
+    """
+    totals = np.nansum(counts, axis=2)
+    totals[np.isnan(counts).all(axis=2)] = np.nan
+    return totals
+
+def get_adoption_half_life(snapshots):
+    """
+    Calculate how many days after publishing each release reached half of its latest download count.
+
+    Downloads are assumed to start at zero on the publish date and to grow linearly
+    between snapshots. Releases without downloads get NaN.
+
+    Args:
+        snapshots (dict): The snapshots from load_release_snapshots.
+
+    Returns:
+        ndarray: The half-life in days per version.
+    """
+    totals = sum_platforms(snapshots['counts'])
+    ages = (snapshots['dates'][None, :] - snapshots['published_at'][:, None]).astype(float)
+
+    # Prepend the publish date itself with zero downloads
+    totals = np.hstack([np.zeros((len(totals), 1)), totals])
+    ages = np.hstack([np.zeros((len(ages), 1)), ages])
+    valid = ~np.isnan(totals) & (ages >= 0)
+
+    # Forward fill missing snapshots with the last valid observation
+    rows = np.arange(len(totals))[:, None]
+    last_valid = np.maximum.accumulate(np.where(valid, np.arange(totals.shape[1]), 0), axis=1)
+    totals = totals[rows, last_valid]
+    ages = ages[rows, last_valid]
+
+    half = totals[:, -1] / 2
+    crossing = np.argmax(totals >= half[:, None], axis=1)
+    crossing = np.maximum(crossing, 1)
+    row = np.arange(len(totals))
+    before, after = crossing - 1, crossing
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        fraction = (half - totals[row, before]) / (totals[row, after] - totals[row, before])
+        half_life = ages[row, before] + fraction * (ages[row, after] - ages[row, before])
+    half_life[~(half > 0)] = np.nan
+    return half_life
+
+def get_platform_mix(snapshots):
+    """
+    Calculate the share of downloads per platform for every snapshot date.
+
+    Args:
+        snapshots (dict): The snapshots from load_release_snapshots.
+
+    Returns:
+        DataFrame: Platform shares (0-100) indexed by snapshot date.
+    """
+    platform_totals = np.nansum(snapshots['counts'], axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        shares = platform_totals / platform_totals.sum(axis=1, keepdims=True) * 100
+    return pd.DataFrame(shares, index=pd.to_datetime(snapshots['dates']), columns=PLATFORMS)
+
+@render_cache.cached_figure
+def draw_release_velocity_graph(snapshots, top_n=10):
+    """
+    Create a line graph of the total downloads per day of the most recent releases.
+    """
+    velocity = sum_platforms(get_downloads_per_day(snapshots))
+    interval_ends = pd.to_datetime(snapshots['dates'][1:])
+
+    plt.figure(figsize=(15, 7))
+    for i in range(max(len(velocity) - top_n, 0), len(velocity)):
+        plt.plot(interval_ends, velocity[i], marker='o', linestyle='-', label=snapshots['versions'][i])
+
+    plt.xlabel('Snapshot Date')
+    plt.ylabel('Downloads per Day')
+    plt.title('Release Download Velocity')
+    plt.legend(title='Version')
+    plt.grid(True, linestyle='--', linewidth=0.5)
+    plt.tight_layout()
+    plt.show()
+
+@render_cache.cached_figure
+def draw_adoption_half_life_graph(snapshots, top_n=10):
+    """
+    Create a bar chart of the adoption half-life of the most recent releases.
+    """
+    half_life = get_adoption_half_life(snapshots)[-top_n:]
+    versions = snapshots['versions'][-top_n:]
+
+    plt.figure(figsize=(12, 6))
+    plt.bar(versions, half_life, color='#773ee9')
+    plt.xticks(rotation=45)
+    plt.xlabel('Version')
+    plt.ylabel('Days to reach half of the downloads')
+    plt.title('Release Adoption Half-Life')
+    plt.tight_layout()
+    plt.show()
+
+@render_cache.cached_figure
+def draw_platform_mix_graph(snapshots):
+    """
+    Create a stacked area chart of the platform share of downloads over time.
+    """
+    mix = get_platform_mix(snapshots)
+
+    plt.figure(figsize=(12, 6))
+    plt.stackplot(mix.index, *[mix[platform] for platform in PLATFORMS], labels=PLATFORMS, alpha=0.8)
+    plt.xlabel('Snapshot Date')
+    plt.ylabel('Percentage of Downloads')
+    plt.title('Platform Mix over Time')
+    plt.legend(title='Platform', loc='upper left')
+    plt.tight_layout()
+    plt.show()
@@ -1,57 +1,176 @@
-from matplotlib.colors import LinearSegmentedColormap, to_rgb
 import numpy as np
 import pandas as pd
 import os
-import requests
+import re
+import json
+import hashlib
 from datetime import datetime
 import matplotlib.pyplot as plt
+import cache
+import datasets
+import release_velocity
+from datasets import generate_gradient_colors
+from release_velocity import PLATFORMS
+import render_cache
 
 save_path = "saved_releases"
+releases_url = "https://api.github.com/repos/obsidianmd/obsidian-releases/releases"
+
+class ReleaseSource(datasets.DatasetSource):
+    """
+    Obsidian release download counts per platform from the GitHub releases API.
+
+    A snapshot is a table of releases instead of a dictionary of counts, so the
+    snapshot handling of the base class is replaced.
+    """
+    name = "releases"
+    save_path = save_path
+
+    @property
+    def stats_url(self):
+        return releases_url if self.repo == datasets.DEFAULT_REPO else f"{self.api_root}/repos/{self.repo}/releases"
+
+    def fetch(self):
+        """
+        Fetch and classify all release assets.
+
+        If the releases cannot be fetched, or offline mode is enabled, the newest
+        saved assets are returned instead. Releases served from an outdated cached
+        copy are returned, but fallback stays set so they are not saved again.
+
+        Returns:
+            DataFrame: The classified assets from get_release_assets_from_url.
+        """
+        self.fallback = True
+        assets, fresh = get_release_assets_from_url(self.stats_url, self.save_path, request_headers=self.headers)
+        if not assets.empty:
+            self.fallback = not fresh
+            return assets
+        print("Using the latest saved release assets instead.")
+        return self.load_latest_assets()
+
+    def update_history(self):
+        """
+        Releases have no monthly history, so a path given for a release target is ignored.
+        """
+        return {}
+
+    def persist(self, assets, history=None):
+        """
+        Save the per-platform totals and the classified assets.
+        """
+        if self.fallback or assets.empty:
+            print("The release data was loaded from saved data and is not saved again.")
+            return
+        save_data(get_platform_totals(assets), self.save_path)
+        save_assets(assets, self.save_path)
+
+    def load_latest_assets(self):
+        """
+        Load the newest saved classified assets.
+        """
+        pattern = re.compile(r'release_assets_\d{4}-\d{2}-\d{2}\.csv')
+        files = sorted(f for f in os.listdir(self.save_path) if pattern.fullmatch(f)) if os.path.exists(self.save_path) else []
+        if not files:
+            return pd.DataFrame(columns=ASSET_COLUMNS)
+        assets = pd.read_csv(os.path.join(self.save_path, files[-1]))
+        assets['published_at'] = pd.to_datetime(assets['published_at']).dt.date
+        return assets
+
+    def load_frames(self, start=None, end=None):
+        """
+        Load the saved snapshots that contain download counts.
+
+        Args:
+            start (str): The first date (YYYY-MM-DD) to include, or None for no limit.
+            end (str): The last date (YYYY-MM-DD) to include, or None for no limit.
+
+        Returns:
+            list: Tuples of snapshot date and DataFrame, in date order.
+        """
+        dated_frames = []
+        for date, path in self.list_snapshots():
+            if (start is not None and date < start) or (end is not None and date > end):
+                continue
+            frame = pd.read_csv(path)
+            # Some early snapshots stored percentage shares instead of download counts
+            values = frame[PLATFORMS].to_numpy(dtype=float)
+            if not np.array_equal(values, np.round(values)):
+                print(f"Skipping {os.path.basename(path)}: it contains percentage shares, not download counts.")
+                continue
+            dated_frames.append((date, frame))
+        return dated_frames
+
+    def load_latest(self):
+        """
+        Load the newest saved snapshot with download counts.
+        """
+        dated_frames = self.load_frames()
+        return dated_frames[-1][1] if dated_frames else pd.DataFrame()
+
+    def load_range(self, start=None, end=None):
+        """
+        Load the saved snapshots between two dates into a (version x date x platform) array.
+
+        Snapshots saved with different classification rules count different assets
+        (snapshots from before the classifier counted every unknown asset as Linux),
+        so only the snapshots classified like the newest one are combined.
+        """
+        dated_frames = self.load_frames(start, end)
+        if dated_frames:
+            newest = get_classifier(dated_frames[-1][1])
+            skipped = [date for date, frame in dated_frames if get_classifier(frame) != newest]
+            if skipped:
+                print(f"Skipping {len(skipped)} release snapshots saved with other classification rules ({skipped[0]} to {skipped[-1]}).")
+                dated_frames = [(date, frame) for date, frame in dated_frames if get_classifier(frame) == newest]
+        return release_velocity.load_release_snapshots(dated_frames)
+
+source = ReleaseSource()
 
 def graph_releases(configuration):
-    # Fetch release data from the URL
-    data = get_release_stats_from_url("https://api.github.com/repos/obsidianmd/obsidian-releases/releases")
+    # Fetch and classify release assets of every configured repository in parallel
+    extra_sources = configuration.get("sources", {}).get("releases", [])
+    all_assets = [assets for assets, _ in datasets.fetch_all([source] + extra_sources)]
+    assets = all_assets[0]
+    data = get_platform_totals(assets)
+    if data.empty:
+        # Without saved assets the per-platform totals of the newest snapshot are still available
+        data = source.load_latest()
 
-    if configuration["releases"] or ["all"]:
-        if configuration["save"]:
-            # Save data to CSV
-            save_data(data, save_path)
+    if configuration["save"]:
+        # Save data to CSV
+        for release_source, release_assets in zip([source] + extra_sources, all_assets):
+            release_source.persist(release_assets)
 
-        if configuration["history"]:
-            # Draw charts
-            draw_stacked_bar_chart(data)
-            draw_cumulative_pie_chart(data)
+    if configuration["history"]:
+        # Draw charts
+        draw_release_graphs(data, assets)
+        draw_source_platform_graph(extra_sources, all_assets)
 
-        if  not any([configuration["save"],configuration["history"]]):
-            save_data(data, save_path)
-            draw_stacked_bar_chart(data)
-            draw_cumulative_pie_chart(data)
+    if  not any([configuration["save"],configuration["history"]]):
+        for release_source, release_assets in zip([source] + extra_sources, all_assets):
+            release_source.persist(release_assets)
+        draw_release_graphs(data, assets)
+        draw_source_platform_graph(extra_sources, all_assets)
 
-def generate_gradient_colors(base_color_hex, num_colors):
+def draw_release_graphs(data, assets):
+    """
+    Draw the platform, architecture, package format and velocity graphs.
     """
-    Generate a gradient of colors starting from a base color in hexadecimal format.
+    draw_stacked_bar_chart(data)
+    draw_cumulative_pie_chart(data)
+    draw_arch_stacked_bar_chart(assets)
+    draw_package_pie_chart(assets)
+    release_velocity.graph_release_velocity(source.load_range())
 
-    Args:
-        base_color_hex (str): The base color in hexadecimal format (e.g., "#RRGGBB").
-        num_colors (int): The number of gradient colors to generate.
+def get_classifier(frame):
+    """
+    Return the classification rules version a release snapshot was saved with, or None for snapshots from before the classifier.
+    """
+    if 'classifier' not in frame.columns or frame.empty:
+        return None
+    return str(frame['classifier'].iloc[0])
 
-    Returns:
-        list: A list of RGB colors forming the gradient.
-    """
-    # Convert the hexadecimal base color code to RGB
-    base_color_rgb = np.array(to_rgb(base_color_hex))
-
-    # Create a slightly lighter version of the base color for the beginning of the gradient
-    light_color = base_color_rgb + (1 - base_color_rgb) * 0.5  # Slightly lighten
-    light_color = np.clip(light_color, 0, 1)  # Ensure values are within a valid range
-
-    # Create a gradient from the lighter version of the base color (start) to the base color (end)
-    cmap = LinearSegmentedColormap.from_list('custom_gradient', [light_color, base_color_rgb], N=num_colors)
-    # Generate color values from the gradient, reversing the order
-    colors = cmap(np.linspace(0, 1, num_colors))[::-1]
-    return colors
-    
-    
 def save_data(data, save_path):
     # Ensure the save_path exists
     if not os.path.exists(save_path):
@@ -61,48 +180,152 @@ def save_data(data, save_path):
     current_date = datetime.now().strftime("%Y-%m-%d")
     file_path = os.path.join(save_path, f'releases_{current_date}.csv')
 
-    # Write data to a CSV file
-    data.to_csv(file_path, index=False, encoding='utf-8')
+    # Write data to a CSV file, recording the classification rules the counts are based on
+    data.assign(classifier=RULES_VERSION).to_csv(file_path, index=False, encoding='utf-8')
     print(f"Data successfully saved to {file_path}")
 
-def get_release_stats_from_url(url):
-    response = requests.get(url)
+# Rules for classifying release assets, checked in order: (pattern, platform, package, default arch).
+# Assets matching no rule (checksums, blockmaps, update manifests) are not counted.
+ASSET_RULES = [
+    (r'\.asar\.gz$', None, None, None),  # In-app update packages, not installs
+    (r'\.dmg$', 'MacOS', 'dmg', 'universal'),
+    (r'mac.*\.zip$', 'MacOS', 'zip', 'universal'),
+    (r'\.exe$', 'Windows', 'exe', 'universal'),
+    (r'\.msi$', 'Windows', 'msi', 'x64'),
+    (r'\.AppImage$', 'Linux', 'AppImage', 'x64'),
+    (r'\.deb$', 'Linux', 'deb', 'x64'),
+    (r'\.snap$', 'Linux', 'snap', 'x64'),
+    (r'\.rpm$', 'Linux', 'rpm', 'x64'),
+    (r'\.tar\.gz$', 'Linux', 'tar.gz', 'x64'),
+]
 
-    if response.status_code != 200:
-        print(f"Error fetching data from {url}. Status code: {response.status_code}")
-        return pd.DataFrame()
+# Rules for detecting the architecture from an asset name, checked in order.
+ARCH_RULES = [
+    (r'arm64|aarch64', 'arm64'),
+    (r'universal', 'universal'),
+    (r'ia32|i386|[-_]32\.', 'x86'),
+    (r'amd64|x86_64|x64', 'x64'),
+]
 
-    releases_data = response.json()
-    processed_data = []
+COMPILED_ASSET_RULES = [(re.compile(pattern, re.IGNORECASE), platform, package, arch) for pattern, platform, package, arch in ASSET_RULES]
+COMPILED_ARCH_RULES = [(re.compile(pattern, re.IGNORECASE), arch) for pattern, arch in ARCH_RULES]
 
-    for release in releases_data:
-        version = release['tag_name']
-        published_at = release['published_at']
-        download_counts = {'Linux': 0, 'Windows': 0, 'MacOS': 0}
+# Fingerprint of the rule tables, so cached classifications are dropped when the rules change
+RULES_VERSION = hashlib.sha256(json.dumps([ASSET_RULES, ARCH_RULES]).encode('utf-8')).hexdigest()[:12]
 
-        for asset in release['assets']:
-            file_name = asset['name']
-            if file_name.endswith('asar.gz'):
-                continue
-            elif file_name.endswith('dmg'):
-                download_counts['MacOS'] += asset['download_count']
-            elif file_name.endswith('exe'):
-                download_counts['Windows'] += asset['download_count']
-            else:
-                download_counts['Linux'] += asset['download_count']
-
-        processed_data.append({
-            'version': version, 
-            'published_at': published_at, 
-            **download_counts
-        })
-
-    df = pd.DataFrame(processed_data)
-    df['published_at'] = pd.to_datetime(df['published_at']).dt.date
-    df.sort_values(by='published_at', ascending=True, inplace=True)
+classification_file = "asset_classification.json"
+
+ASSET_COLUMNS = ['version', 'published_at', 'platform', 'arch', 'package', 'downloads']
+
+def classify_asset(file_name):
+    """
+    Classify a release asset by platform, architecture and package type.
+
+    Args:
+        file_name (str): The asset file name.
+
+    Returns:
+        tuple: (platform, arch, package), or None if the asset is not an installable build.
+    """
+    for pattern, platform, package, default_arch in COMPILED_ASSET_RULES:
+        if pattern.search(file_name):
+            if platform is None:
+                return None
+            arch = next((arch for arch_pattern, arch in COMPILED_ARCH_RULES if arch_pattern.search(file_name)), default_arch)
+            return platform, arch, package
+    return None
+
+def load_classification_cache(save_path):
+    """
+    Load cached asset classifications keyed by asset id, dropping them if the rules changed.
+    """
+    file_path = os.path.join(save_path, classification_file)
+    if not os.path.exists(file_path):
+        return {}
+    with open(file_path, 'r', encoding='utf-8') as file:
+        cached = json.load(file)
+    if cached.get('rules') != RULES_VERSION:
+        return {}
+    return cached['assets']
+
+def save_classification_cache(classifications, save_path):
+    """
+    Save asset classifications keyed by asset id.
+    """
+    if not os.path.exists(save_path):
+        os.makedirs(save_path)
+    file_path = os.path.join(save_path, classification_file)
+    with open(file_path, 'w', encoding='utf-8') as file:
+        json.dump({'rules': RULES_VERSION, 'assets': classifications}, file)
+
+def get_release_assets_from_url(url, save_path=save_path, per_page=100, request_headers=None):
+    """
+    Fetch all paginated releases through the cache and classify every asset.
+
+    Args:
+        url (str): The GitHub releases API URL.
+        save_path (str): The directory the asset classification cache is stored in.
+        per_page (int): The number of releases requested per page.
+        request_headers (dict): Optional HTTP headers, e.g. for authentication with a mirror.
 
+    Returns:
+        tuple: A DataFrame with one row per installable asset (version, publish date,
+        platform, arch, package and downloads) and whether every page was fresh.
+    """
+    classifications = load_classification_cache(save_path)
+    rows = []
+    fresh = True
+
+    page = 1
+    while True:
+        releases, page_fresh = cache.fetch_cached_json(f"{url}?per_page={per_page}&page={page}", request_headers, max_age=datasets.stats_max_age)
+        if releases is None:
+            # An incomplete list of releases would be saved as a wrong snapshot, so nothing is returned
+            return pd.DataFrame(columns=ASSET_COLUMNS), False
+        fresh = fresh and page_fresh
+
+        for release in releases:
+            for asset in release['assets']:
+                asset_id = str(asset['id'])
+                # Only classify assets that were not seen before
+                if asset_id not in classifications:
+                    classifications[asset_id] = classify_asset(asset['name'])
+                classification = classifications[asset_id]
+                if classification is None:
+                    continue
+                rows.append((release['tag_name'], release['published_at'], *classification, asset['download_count']))
+
+        # A page shorter than requested is the last one
+        if len(releases) < per_page:
+            break
+        page += 1
+
+    save_classification_cache(classifications, save_path)
+
+    assets = pd.DataFrame(rows, columns=ASSET_COLUMNS)
+    assets['published_at'] = pd.to_datetime(assets['published_at']).dt.date
+    return assets, fresh
+
+def get_platform_totals(assets):
+    """
+    Sum asset downloads per release and platform.
+
+    Args:
+        assets (DataFrame): The classified assets from get_release_assets_from_url.
+
+    Returns:
+        DataFrame: One row per release with Linux, Windows and MacOS download counts.
+    """
+    if assets.empty:
+        return pd.DataFrame()
+
+    df = assets.pivot_table(index=['version', 'published_at'], columns='platform', values='downloads', aggfunc='sum', fill_value=0)
+    df = df.reindex(columns=['Linux', 'Windows', 'MacOS'], fill_value=0).reset_index()
+    df.columns.name = None
+    df.sort_values(by='published_at', ascending=True, inplace=True)
     return df
 
+@render_cache.cached_figure
 def draw_stacked_bar_chart(df):
     # Calculate the percentage share for each platform
     df_percent = df[['Linux', 'Windows', 'MacOS']].div(df[['Linux', 'Windows', 'MacOS']].sum(axis=1), axis=0) * 100
@@ -118,6 +341,7 @@ def draw_stacked_bar_chart(df):
     plt.legend(title='Platform', labels=['Linux', 'Windows', 'MacOS'])
     plt.show()
 
+@render_cache.cached_figure
 def draw_cumulative_pie_chart(df):
     # Sum the downloads for each platform
     platform_totals = df[['Linux', 'Windows', 'MacOS']].sum()
@@ -131,4 +355,74 @@ def draw_cumulative_pie_chart(df):
     plt.figure(figsize=(8, 8))
     plt.pie(platform_totals, labels=platform_totals.index, autopct='%1.1f%%', startangle=140, colors=pie_colors)
     plt.title('Cumulative Download Numbers by Platform')
-    plt.show()
\ No newline at end of file
+    plt.show()
+
+def draw_source_platform_graph(extra_sources, all_assets):
+    """
+    Draw the downloads per platform of every configured repository side by side.
+    """
+    if not extra_sources:
+        return
+    labels = [source.label] + [extra_source.label for extra_source in extra_sources]
+    totals = pd.DataFrame({label: get_platform_totals(assets).reindex(columns=PLATFORMS, fill_value=0).sum() for label, assets in zip(labels, all_assets)}).T
+    draw_platform_comparison_chart(totals)
+
+@render_cache.cached_figure
+def draw_platform_comparison_chart(totals):
+    """
+    Create a grouped bar chart of the total downloads per platform for each repository.
+
+    Args:
+        totals (DataFrame): One row per repository with a column per platform.
+    """
+    totals.plot(kind='bar', figsize=(10, 6))
+    plt.xlabel('Repository')
+    plt.ylabel('Downloads')
+    plt.title('Downloads by Repository and Platform')
+    plt.xticks(rotation=0)
+    plt.legend(title='Platform')
+    plt.tight_layout()
+    plt.show()
+
+@render_cache.cached_figure
+def draw_arch_stacked_bar_chart(assets):
+    """
+    Create a stacked bar chart of the download share per architecture for each version.
+    """
+    df = assets.pivot_table(index=['published_at', 'version'], columns='arch', values='downloads', aggfunc='sum', fill_value=0)
+    df_percent = df.div(df.sum(axis=1), axis=0) * 100
+    df_percent.index = df_percent.index.get_level_values('version')
+
+    df_percent.plot(kind='bar', stacked=True, figsize=(10, 6))
+    plt.xlabel('Version')
+    plt.ylabel('Percentage of Downloads')
+    plt.title('Stacked Bar Chart of Downloads by Version and Architecture')
+    plt.legend(title='Architecture')
+    plt.show()
+
+@render_cache.cached_figure
+def draw_package_pie_chart(assets):
+    """
+    Create a pie chart of the cumulative downloads per platform and package format.
+    """
+    package_totals = assets.groupby(['platform', 'package'])['downloads'].sum().sort_values(ascending=False)
+    labels = [f"{platform} {package}" for platform, package in package_totals.index]
+
+    pie_colors = generate_gradient_colors("#773ee9", len(package_totals))
+
+    plt.figure(figsize=(8, 8))
+    plt.pie(package_totals, labels=labels, autopct='%1.1f%%', startangle=140, colors=pie_colors)
+    plt.title('Cumulative Download Numbers by Package Format')
+    plt.show()
+
+def save_assets(assets, save_path):
+    """
+    Save the classified release assets to a CSV file with the current date in the filename.
+    """
+    if not os.path.exists(save_path):
+        os.makedirs(save_path)
+
+    current_date = datetime.now().strftime("%Y-%m-%d")
+    file_path = os.path.join(save_path, f'release_assets_{current_date}.csv')
+    assets.to_csv(file_path, index=False, encoding='utf-8')
+    print(f"Asset data successfully saved to {file_path}")
@@ -0,0 +1,179 @@
+import os
+import re
+import json
+import time
+import hashlib
+import inspect
+import functools
+import numpy as np
+import pandas as pd
+import matplotlib
+import matplotlib.pyplot as plt
+
+# Directory the charts are written to. None keeps the interactive plt.show() windows.
+output_path = None
+force = False
+
+manifest_file = ".render_manifest.json"
+manifest = {}
+run_started = 0
+
+def configure(path, force_render=False):
+    """
+    Switch to file output mode, writing every chart as a PNG into a directory.
+
+    Args:
+        path (str): The output directory.
+        force_render (bool): Whether to re-render charts even if a cached artifact exists.
+    """
+    global output_path, force, manifest, run_started
+    output_path = path
+    force = force_render
+    run_started = time.time()
+    matplotlib.use('Agg')
+
+    if not os.path.exists(output_path):
+        os.makedirs(output_path)
+    manifest = load_manifest()
+
+def cached_figure(draw_function):
+    """
+    Decorator that skips re-rendering a chart when its input data and style have not changed.
+
+    Charts with an empty data argument are skipped entirely.
+
+    In file output mode the arguments, the drawing code and the matplotlib style are
+    hashed. If an artifact with that hash exists it is reused, otherwise the chart is
+    drawn and saved under the hash.
+    """
+    @functools.wraps(draw_function)
+    def wrapper(*args, **kwargs):
+        # Charts without data would fail or come out empty, e.g. when nothing could be fetched or loaded
+        if any(is_empty(arg) for arg in args):
+            print(f"Skipping {draw_function.__name__}: no data available.")
+            return
+
+        if output_path is None:
+            return draw_function(*args, **kwargs)
+
+        name = get_chart_identity(draw_function, args, kwargs)
+        key = get_figure_key(draw_function, args, kwargs)
+        file_name = f"{name}_{key}.png"
+        file_path = os.path.join(output_path, file_name)
+
+        manifest[file_name] = time.time()
+        if os.path.exists(file_path) and not force:
+            print(f"{name} unchanged, reusing {file_path}")
+            return
+
+        draw_function(*args, **kwargs)
+        plt.gcf().savefig(file_path, bbox_inches='tight')
+        plt.close('all')
+        print(f"{name} rendered to {file_path}")
+    return wrapper
+
+def is_empty(value):
+    """
+    Check whether a chart input holds no data.
+    """
+    if value is None:
+        return True
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return value.empty
+    if isinstance(value, (dict, list, tuple, np.ndarray)):
+        return len(value) == 0
+    return False
+
+def get_chart_identity(draw_function, args, kwargs):
+    """
+    Return the name that identifies a chart across runs.
+
+    Shared draw functions are called for several charts, so the title argument,
+    if the function has one, is part of the name. Eviction groups artifacts by
+    this name, so one chart never supersedes another.
+    """
+    name = f"{draw_function.__module__}.{draw_function.__name__}"
+    try:
+        title = inspect.signature(draw_function).bind(*args, **kwargs).arguments.get('title')
+    except TypeError:
+        title = None
+    if title:
+        # Keep the title safe for file names; underscores separate the hash suffix
+        name += f"[{re.sub(r'[^A-Za-z0-9]+', '-', str(title)).strip('-')}]"
+    return name
+
+def get_figure_key(draw_function, args, kwargs):
+    """
+    Hash the arguments, source code and style of a draw function call.
+    """
+    digest = hashlib.sha256()
+    digest.update(inspect.getsource(draw_function).encode('utf-8'))
+    digest.update(repr(sorted((key, str(value)) for key, value in plt.rcParams.items())).encode('utf-8'))
+    update_hash(digest, args)
+    update_hash(digest, kwargs)
+    return digest.hexdigest()[:16]
+
+def update_hash(digest, value):
+    """
+    Feed a value into a hash, handling the data types passed to the draw functions.
+    """
+    if isinstance(value, pd.DataFrame):
+        digest.update(repr(list(value.columns)).encode('utf-8'))
+        digest.update(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+    elif isinstance(value, (pd.Series, pd.Index)):
+        digest.update(pd.util.hash_pandas_object(value).to_numpy().tobytes())
+    elif isinstance(value, np.ndarray):
+        digest.update(f"{value.dtype}{value.shape}".encode('utf-8'))
+        digest.update(value.tobytes() if value.dtype != object else repr(value.tolist()).encode('utf-8'))
+    elif isinstance(value, dict):
+        for key in sorted(value, key=str):
+            digest.update(repr(key).encode('utf-8'))
+            update_hash(digest, value[key])
+    elif isinstance(value, (list, tuple)):
+        digest.update(f"{type(value).__name__}{len(value)}".encode('utf-8'))
+        for item in value:
+            update_hash(digest, item)
+    else:
+        digest.update(repr(value).encode('utf-8'))
+
+def get_chart_name(file_name):
+    """
+    Return the chart name of an artifact file name by stripping the hash suffix.
+    """
+    return file_name.rsplit('_', 1)[0]
+
+def load_manifest():
+    """
+    Load the last-used timestamps of the rendered artifacts.
+    """
+    file_path = os.path.join(output_path, manifest_file)
+    if not os.path.exists(file_path):
+        return {}
+    with open(file_path, 'r', encoding='utf-8') as file:
+        return json.load(file)
+
+def evict_stale(max_age_days=30):
+    """
+    Delete stale artifacts and save the manifest.
+
+    An artifact is stale when the same chart was rendered from newer data during this
+    run, or when it has not been used for a number of days.
+
+    Args:
+        max_age_days (int): The number of days an unused artifact is kept.
+    """
+    if output_path is None:
+        return
+
+    cutoff = time.time() - max_age_days * 24 * 60 * 60
+    charts_used = {get_chart_name(file_name) for file_name, last_used in manifest.items() if last_used >= run_started}
+    for file_name, last_used in list(manifest.items()):
+        superseded = last_used < run_started and get_chart_name(file_name) in charts_used
+        if superseded or last_used < cutoff:
+            file_path = os.path.join(output_path, file_name)
+            if os.path.exists(file_path):
+                os.remove(file_path)
+            del manifest[file_name]
+
+    with open(os.path.join(output_path, manifest_file), 'w', encoding='utf-8') as file:
+        json.dump(manifest, file, indent=4)
@@ -0,0 +1,303 @@
+import os
+import json
+import bisect
+import difflib
+import numpy as np
+import pandas as pd
+import archive
+import cache
+
+index_folder = "index"
+
+# Bump when the layout of the index files changes, so old indexes are rebuilt
+INDEX_VERSION = 1
+
+def get_index_paths(source):
+    """
+    Return the paths of the manifest and the order, count and rank matrices of a dataset's index.
+    """
+    directory = os.path.join(source.save_path, index_folder)
+    return {
+        'manifest': os.path.join(directory, f"{source.name}_index.json"),
+        'order': os.path.join(directory, f"{source.name}_order.npy"),
+        'counts': os.path.join(directory, f"{source.name}_counts.npy"),
+        'ranks': os.path.join(directory, f"{source.name}_ranks.npy")
+    }
+
+def build_index(source):
+    """
+    Bring the search and ranking index of a dataset up to date with its saved snapshots.
+
+    The index holds three (date x id) matrices: the ids of every snapshot sorted
+    by downloads, the matching download counts and the rank of every id. Only
+    snapshots that are not indexed yet, or whose CSV was saved again since, are
+    read; the rows of the other indexed snapshots are copied over when new ids
+    widen the matrices.
+
+    Args:
+        source (DatasetSource): The plugin or theme dataset.
+
+    Returns:
+        dict: The loaded index, see load_index.
+    """
+    paths = get_index_paths(source)
+    index = load_index(source)
+    old_dates = index['dates'] if index else []
+    indexed = set(old_dates)
+    # The modification time of every indexed CSV, so a snapshot saved again the same day is read again
+    modified = dict(index.get('modified', {})) if index else {}
+    new_snapshots = []
+    for date, path in source.list_snapshots():
+        mtime = os.path.getmtime(path)
+        if date not in indexed or modified.get(date) != mtime:
+            new_snapshots.append(date)
+            modified[date] = mtime
+
+    # Queries against an up-to-date index never touch the network
+    if not new_snapshots and index and index['metadata']:
+        return index
+
+    # The catalog is only downloaded when the index is rebuilt or still lacks metadata
+    metadata = get_metadata(source) or (index['metadata'] if index else {})
+    if not new_snapshots and index and not metadata:
+        return index
+
+    ids = list(index['ids']) if index else []
+    positions = {item_id: i for i, item_id in enumerate(ids)}
+
+    # Read the new snapshots, assigning positions to ids seen for the first time
+    snapshot_rows = {}
+    for date in new_snapshots:
+        id_chunks, count_chunks = [], []
+        for _, chunk_ids, chunk_counts in archive.iter_snapshot_chunks(source, date, date):
+            for item_id in chunk_ids:
+                if item_id not in positions:
+                    positions[item_id] = len(ids)
+                    ids.append(item_id)
+            id_chunks.append(np.array([positions[item_id] for item_id in chunk_ids], dtype=np.int32))
+            count_chunks.append(chunk_counts)
+        if id_chunks:
+            snapshot_rows[date] = (np.concatenate(id_chunks), np.concatenate(count_chunks))
+
+    dates = sorted(indexed | set(snapshot_rows))
+    if not dates:
+        return None
+    width = len(ids)
+    order = np.full((len(dates), width), -1, dtype=np.int32)
+    counts = np.zeros((len(dates), width), dtype=np.int64)
+    ranks = np.full((len(dates), width), -1, dtype=np.int32)
+
+    for row, date in enumerate(dates):
+        if date in snapshot_rows:
+            item_positions, item_counts = snapshot_rows[date]
+            # Stable sort, so ties keep the order of the saved snapshot
+            sort = np.argsort(-item_counts, kind='stable')
+            order[row, :len(sort)] = item_positions[sort]
+            counts[row, :len(sort)] = item_counts[sort]
+            ranks[row, item_positions[sort]] = np.arange(len(sort), dtype=np.int32)
+        else:
+            old_row = old_dates.index(date)
+            old_width = index['order'].shape[1]
+            order[row, :old_width] = index['order'][old_row]
+            counts[row, :old_width] = index['counts'][old_row]
+            ranks[row, :old_width] = index['ranks'][old_row]
+
+    directory = os.path.dirname(paths['manifest'])
+    if not os.path.exists(directory):
+        os.makedirs(directory)
+
+    # Release the memory maps of the old index before its files are replaced
+    index = None
+    for key, matrix in (('order', order), ('counts', counts), ('ranks', ranks)):
+        with open(f"{paths[key]}.tmp", 'wb') as file:
+            np.save(file, matrix)
+        os.replace(f"{paths[key]}.tmp", paths[key])
+
+    # The manifest is written last, since it marks a finished index
+    manifest = {'version': INDEX_VERSION, 'dates': dates, 'ids': ids, 'metadata': metadata,
+                'modified': {date: modified[date] for date in dates if date in modified}}
+    with open(f"{paths['manifest']}.tmp", 'w', encoding='utf-8') as file:
+        json.dump(manifest, file)
+    os.replace(f"{paths['manifest']}.tmp", paths['manifest'])
+    print(f"Indexed {len(snapshot_rows)} new or changed {source.name} snapshots ({len(dates)} dates, {width} ids).")
+
+    return load_index(source)
+
+def load_index(source):
+    """
+    Load the index of a dataset with memory-mapped matrices.
+
+    Returns:
+        dict: The dates, ids, metadata, the order, counts and ranks matrices and
+        the sorted search keys, or None if no up-to-date index exists.
+    """
+    paths = get_index_paths(source)
+    try:
+        with open(paths['manifest'], 'r', encoding='utf-8') as file:
+            manifest = json.load(file)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+    if manifest.get('version') != INDEX_VERSION:
+        return None
+
+    index = dict(manifest)
+    for key in ('order', 'counts', 'ranks'):
+        index[key] = np.load(paths[key], mmap_mode='r')
+
+    # Every id is searchable by itself and by its display name
+    keys = [(item_id.lower(), i) for i, item_id in enumerate(index['ids'])]
+    for i, item_id in enumerate(index['ids']):
+        name = index['metadata'].get(item_id, {}).get('name')
+        if name and name.lower() != item_id.lower():
+            keys.append((name.lower(), i))
+    keys.sort()
+    index['keys'] = keys
+    return index
+
+def get_metadata(source):
+    """
+    Load the display name and author of every item from the dataset's catalog.
+
+    Returns:
+        dict: Id mapped to a dictionary with name and author, or an empty dictionary if the catalog is unavailable.
+    """
+    if source.catalog_url is None:
+        return {}
+    catalog = cache.get_cached_json(source.catalog_url, source.raw_headers)
+    if not catalog:
+        return {}
+    return {
+        str(entry[source.catalog_key]): {'name': entry.get('name', ''), 'author': entry.get('author', '')}
+        for entry in catalog if source.catalog_key in entry
+    }
+
+def search(index, query, limit=10):
+    """
+    Find ids whose id or display name starts with a query, or else resembles it.
+
+    Args:
+        index (dict): The loaded index.
+        query (str): The text to search for.
+        limit (int): The maximum number of results.
+
+    Returns:
+        list: Matching ids, prefix matches first.
+    """
+    query = query.lower()
+    keys = index['keys']
+    matches = []
+
+    # Prefix matches are a contiguous range of the sorted keys
+    start = bisect.bisect_left(keys, (query, -1))
+    for key, i in keys[start:]:
+        if not key.startswith(query) or len(matches) >= limit:
+            break
+        if i not in matches:
+            matches.append(i)
+
+    if len(matches) < limit:
+        close = difflib.get_close_matches(query, [key for key, _ in keys], n=limit * 2, cutoff=0.6)
+        lookup = dict(keys)
+        for key in close:
+            if lookup[key] not in matches and len(matches) < limit:
+                matches.append(lookup[key])
+
+    return [index['ids'][i] for i in matches]
+
+def get_snapshot_row(index, date=None):
+    """
+    Return the row of the newest snapshot on or before a date, or None if there is none.
+    """
+    if not index['dates']:
+        return None
+    if date is None:
+        return len(index['dates']) - 1
+    row = bisect.bisect_right(index['dates'], date) - 1
+    return row if row >= 0 else None
+
+def get_top_k(index, k=10, date=None):
+    """
+    Return the K most downloaded ids on a date.
+
+    Args:
+        index (dict): The loaded index.
+        k (int): The number of ids.
+        date (str): The date (YYYY-MM-DD); the newest snapshot on or before it is used. None uses the newest snapshot.
+
+    Returns:
+        DataFrame: Rank, id, name and downloads of the top K ids.
+    """
+    row = get_snapshot_row(index, date)
+    if row is None:
+        return pd.DataFrame(columns=['Rank', 'Name', 'Title', 'Downloads'])
+
+    positions = np.asarray(index['order'][row, :k])
+    counts = np.asarray(index['counts'][row, :k])
+    valid = positions >= 0
+    ids = [index['ids'][i] for i in positions[valid]]
+    return pd.DataFrame({
+        'Name': ids,
+        'Title': [index['metadata'].get(item_id, {}).get('name', '') for item_id in ids],
+        'Downloads': counts[valid]
+    }, index=pd.RangeIndex(1, valid.sum() + 1, name='Rank'))
+
+def get_rank_history(index, item_id):
+    """
+    Return the rank and download count of an id on every indexed date.
+
+    Args:
+        index (dict): The loaded index.
+        item_id (str): The plugin id or theme name.
+
+    Returns:
+        DataFrame: Rank (1 is the most downloaded) and downloads indexed by date; dates without the id are left out.
+    """
+    if item_id not in index['ids']:
+        return pd.DataFrame(columns=['Rank', 'Downloads'])
+
+    column = index['ids'].index(item_id)
+    ranks = np.asarray(index['ranks'][:, column])
+    present = ranks >= 0
+    rows = np.flatnonzero(present)
+    downloads = np.asarray(index['counts'][rows, ranks[present]])
+    return pd.DataFrame({'Rank': ranks[present] + 1, 'Downloads': downloads},
+                        index=pd.Index([index['dates'][row] for row in rows], name='Date'))
+
+def run_query(source, search_text=None, top=None, date=None, rank=None):
+    """
+    Update the index of a dataset and print the results of the requested queries.
+
+    Args:
+        source (DatasetSource): The plugin or theme dataset.
+        search_text (str): Text to look up ids by prefix or similarity.
+        top (int): Number of most downloaded ids to list.
+        date (str): The date (YYYY-MM-DD) of the top list.
+        rank (str): An id whose rank over time is listed.
+    """
+    index = build_index(source)
+    if index is None:
+        print(f"No saved {source.name} snapshots to index.")
+        return
+
+    if search_text:
+        matches = search(index, search_text)
+        print(f"{source.name.capitalize()} matching '{search_text}':")
+        for item_id in matches:
+            name = index['metadata'].get(item_id, {}).get('name', '')
+            print(f"  {item_id}" + (f" ({name})" if name and name != item_id else ""))
+        if not matches:
+            print("  No matches.")
+    if top:
+        row = get_snapshot_row(index, date)
+        if row is None:
+            print(f"No {source.name} snapshot on or before {date}.")
+        else:
+            print(f"Top {top} {source.name} on {index['dates'][row]}:")
+            print(get_top_k(index, top, date).to_string())
+    if rank:
+        history = get_rank_history(index, rank)
+        if history.empty:
+            print(f"'{rank}' is not in the {source.name} index. Similar: {', '.join(search(index, rank, 5)) or 'none'}")
+        else:
+            print(f"Rank of {rank} over time:")
+            print(history.to_string())
@@ -0,0 +1,171 @@
+import os
+import sqlite3
+import archive
+import datasets
+from release_velocity import PLATFORMS
+
+# Number of rows inserted per executemany call
+BATCH_SIZE = 10_000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    kind TEXT NOT NULL,
+    id TEXT NOT NULL,
+    date TEXT NOT NULL,
+    downloads INTEGER NOT NULL,
+    PRIMARY KEY (kind, id, date)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS snapshots_kind_date ON snapshots (kind, date);
+
+CREATE TABLE IF NOT EXISTS monthly (
+    kind TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    month TEXT NOT NULL,
+    value INTEGER NOT NULL,
+    PRIMARY KEY (kind, metric, month)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS release_platforms (
+    kind TEXT NOT NULL,
+    id TEXT NOT NULL,
+    date TEXT NOT NULL,
+    platform TEXT NOT NULL,
+    published_at TEXT,
+    downloads INTEGER NOT NULL,
+    PRIMARY KEY (kind, id, date, platform)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS release_platforms_kind_date ON release_platforms (kind, date);
+
+CREATE TABLE IF NOT EXISTS exported_snapshots (
+    kind TEXT NOT NULL,
+    date TEXT NOT NULL,
+    modified REAL,
+    PRIMARY KEY (kind, date)
+) WITHOUT ROWID;
+"""
+
+def export_database(file_path, sources, release_sources=()):
+    """
+    Upsert the saved snapshots, monthly series and release platform counts into a SQLite database.
+
+    The modification time of every exported snapshot file is recorded, so a run
+    only reads the snapshots saved (or saved again) since the last export. Every
+    snapshot is written in its own transaction together with its export marker,
+    so an interrupted export is resumed cleanly.
+
+    Sources of forks or mirrors are stored under their own kind, see get_kind.
+
+    Args:
+        file_path (str): The SQLite database file.
+        sources (list): The plugin and theme datasets.
+        release_sources (list): The release datasets.
+    """
+    directory = os.path.dirname(file_path)
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory)
+
+    connection = sqlite3.connect(file_path)
+    try:
+        connection.executescript(SCHEMA)
+        # Databases created before the modification times were recorded lack the column
+        columns = {row[1] for row in connection.execute("PRAGMA table_info(exported_snapshots)")}
+        if 'modified' not in columns:
+            connection.execute("ALTER TABLE exported_snapshots ADD COLUMN modified REAL")
+        for source in sources:
+            rows = export_snapshots(connection, source)
+            export_monthly(connection, source)
+            print(f"Exported {rows} new {get_kind(source)} rows to {file_path}.")
+        for release_source in release_sources:
+            rows = export_release_platforms(connection, release_source)
+            print(f"Exported {rows} new {get_kind(release_source)} rows to {file_path}.")
+    finally:
+        connection.close()
+
+def get_kind(source):
+    """
+    Return the kind a source is stored under: its name, followed by the repository for forks and mirrors.
+    """
+    return source.name if source.repo == datasets.DEFAULT_REPO else f"{source.name}@{source.repo}"
+
+def get_pending_snapshots(connection, source):
+    """
+    Return the snapshots of a dataset that are new or were saved again since they were exported.
+
+    Returns:
+        list: Tuples of snapshot date and file modification time.
+    """
+    exported = dict(connection.execute("SELECT date, modified FROM exported_snapshots WHERE kind = ?", (get_kind(source),)))
+    pending = []
+    for date, path in source.list_snapshots():
+        modified = os.path.getmtime(path)
+        if exported.get(date) != modified:
+            pending.append((date, modified))
+    return pending
+
+def mark_exported(connection, kind, date, modified):
+    """
+    Record that a snapshot file was exported, as part of the current transaction.
+    """
+    connection.execute("INSERT OR REPLACE INTO exported_snapshots (kind, date, modified) VALUES (?, ?, ?)", (kind, date, modified))
+
+def export_snapshots(connection, source):
+    """
+    Insert the download counts of every snapshot that was not exported yet or changed since.
+
+    Returns:
+        int: The number of inserted rows.
+    """
+    kind = get_kind(source)
+    rows = 0
+    for date, modified in get_pending_snapshots(connection, source):
+        with connection:
+            # A snapshot saved again replaces all of its rows, including ids it no longer has
+            connection.execute("DELETE FROM snapshots WHERE kind = ? AND date = ?", (kind, date))
+            for _, ids, counts in archive.iter_snapshot_chunks(source, date, date, chunksize=BATCH_SIZE):
+                connection.executemany(
+                    "INSERT INTO snapshots (kind, id, date, downloads) VALUES (?, ?, ?, ?)",
+                    zip([kind] * len(ids), ids.tolist(), [date] * len(ids), counts.tolist()))
+                rows += len(ids)
+            mark_exported(connection, kind, date, modified)
+    return rows
+
+def export_monthly(connection, source):
+    """
+    Upsert the monthly series of a dataset, only writing values that changed.
+    """
+    with connection:
+        for metric, values in source.load_monthly().items():
+            connection.executemany(
+                """INSERT INTO monthly (kind, metric, month, value) VALUES (?, ?, ?, ?)
+                   ON CONFLICT (kind, metric, month) DO UPDATE SET value = excluded.value
+                   WHERE value != excluded.value""",
+                [(get_kind(source), metric, month, int(value)) for month, value in values.items()])
+
+def export_release_platforms(connection, source):
+    """
+    Insert the per-platform download counts of every release snapshot that was not exported yet or changed since.
+
+    Snapshots without download counts (the early percentage shares) are marked as
+    exported without rows, so they are not read again.
+
+    Returns:
+        int: The number of inserted rows.
+    """
+    kind = get_kind(source)
+    rows = 0
+    for date, modified in get_pending_snapshots(connection, source):
+        batch = []
+        for _, frame in source.load_frames(date, date):
+            for platform in PLATFORMS:
+                batch.extend(zip([kind] * len(frame), frame['version'].astype(str), [date] * len(frame), [platform] * len(frame),
+                                 frame['published_at'].astype(str), frame[platform].astype(int).tolist()))
+        with connection:
+            connection.execute("DELETE FROM release_platforms WHERE kind = ? AND date = ?", (kind, date))
+            for i in range(0, len(batch), BATCH_SIZE):
+                connection.executemany(
+                    """INSERT INTO release_platforms (kind, id, date, platform, published_at, downloads)
+                       VALUES (?, ?, ?, ?, ?, ?)""",
+                    batch[i:i + BATCH_SIZE])
+            mark_exported(connection, kind, date, modified)
+        rows += len(batch)
+    return rows
@@ -0,0 +1,166 @@
+import os
+import json
+import numpy as np
+import pandas as pd
+from datetime import datetime
+
+quarantine_path = "quarantine"
+
+# Robust z-scores above this value are reported as anomalies
+ANOMALY_THRESHOLD = 3.5
+
+# Fraction of missing ids that always means a truncated snapshot, however old the previous snapshot is
+TRUNCATION_FRACTION = 0.5
+
+# Whether snapshots that fail validation are accepted anyway, with their problems reported
+accept_invalid = False
+
+def set_accept_invalid(enabled=True):
+    """
+    Accept snapshots even if they fail validation, e.g. after a legitimate large change.
+    """
+    global accept_invalid
+    accept_invalid = enabled
+
+def validate_stats_snapshot(data, count_key, previous=None, tolerance=0.01, previous_age_days=0):
+    """
+    Check a stats snapshot for schema errors and cumulative counts that went down.
+
+    Ids legitimately disappear over time, so the fraction of ids of the previous
+    snapshot allowed to be missing grows by tolerance for every 30 days of its age,
+    up to TRUNCATION_FRACTION.
+
+    Args:
+        data (dict): Stats data keyed by id, e.g. community-plugin-stats.json.
+        count_key (str): The key holding the cumulative download count ('downloads' or 'download').
+        previous (dict): Optional mapping of id to the download count of the previous snapshot.
+        tolerance (float): Fraction of ids allowed to decrease or go missing before the snapshot is rejected.
+        previous_age_days (int): The age of the previous snapshot in days.
+
+    Returns:
+        list: Descriptions of the problems found. An empty list means the snapshot is valid.
+    """
+    if not isinstance(data, dict) or not data:
+        return ["Snapshot is empty or not a JSON object."]
+
+    ids = list(data.keys())
+    counts = pd.to_numeric(pd.Series([values.get(count_key) if isinstance(values, dict) else None for values in data.values()], index=ids), errors='coerce')
+
+    problems = []
+    invalid = counts.isna() | (counts < 0)
+    if invalid.any():
+        problems.append(f"{invalid.sum()} entries have a missing or invalid '{count_key}' value, e.g. {', '.join(counts.index[invalid][:5])}.")
+
+    if previous:
+        # Align on id so the comparison is a single vectorized subtraction
+        previous_counts = pd.Series(previous, dtype=float).reindex(counts.index)
+        decreased = counts < previous_counts
+        if decreased.sum() > tolerance * len(counts):
+            problems.append(f"{decreased.sum()} cumulative counts decreased since the previous snapshot, e.g. {', '.join(counts.index[decreased][:5])}.")
+
+        missing = len(set(previous) - set(ids))
+        missing_tolerance = min(tolerance * (1 + previous_age_days / 30), TRUNCATION_FRACTION)
+        if missing > missing_tolerance * len(previous):
+            problems.append(f"{missing} ids of the previous snapshot ({previous_age_days} days old) are missing.")
+
+    return problems
+
+def validate_catalog_snapshot(data, required_key):
+    """
+    Check a catalog snapshot (a JSON list such as community-css-themes.json) for schema errors.
+
+    Args:
+        data (list): The catalog entries.
+        required_key (str): A key every entry must have.
+
+    Returns:
+        list: Descriptions of the problems found.
+    """
+    if not isinstance(data, list) or not data:
+        return ["Snapshot is empty or not a JSON list."]
+    invalid = sum(1 for entry in data if not isinstance(entry, dict) or required_key not in entry)
+    if invalid:
+        return [f"{invalid} entries are missing '{required_key}'."]
+    return []
+
+def validate_monthly_series(monthly_values, name, cumulative=False):
+    """
+    Check a monthly series for decreases (if cumulative) and robust z-score anomalies.
+
+    Args:
+        monthly_values (dict): Month (YYYY-MM) mapped to a value.
+        name (str): The name of the series used in the report.
+        cumulative (bool): Whether the values must never decrease.
+
+    Returns:
+        list: Descriptions of the problems found.
+    """
+    if not monthly_values:
+        return []
+    months = np.array(sorted(monthly_values))
+    values = np.array([monthly_values[month] for month in months], dtype=float)
+
+    problems = []
+    changes = np.diff(values)
+    if cumulative and (changes < 0).any():
+        problems.append(f"{name} decreased in {', '.join(months[1:][changes < 0])}.")
+
+    anomalies = months[1:][get_anomalies(changes)]
+    if anomalies.size:
+        problems.append(f"{name} has unusual month-over-month changes in {', '.join(anomalies)}.")
+    return problems
+
+def get_anomalies(values, threshold=ANOMALY_THRESHOLD):
+    """
+    Flag values whose robust z-score (based on the median absolute deviation) exceeds a threshold.
+
+    Args:
+        values (ndarray): The values to check.
+        threshold (float): The robust z-score above which a value is an anomaly.
+
+    Returns:
+        ndarray: A boolean mask of anomalies.
+    """
+    values = np.asarray(values, dtype=float)
+    if values.size < 3:
+        return np.zeros(values.shape, dtype=bool)
+
+    median = np.median(values)
+    mad = np.median(np.abs(values - median))
+    if mad == 0:
+        return values != median
+    # 0.6745 scales the MAD to the standard deviation of a normal distribution
+    robust_z = 0.6745 * (values - median) / mad
+    return np.abs(robust_z) > threshold
+
+def quarantine_snapshot(data, kind, problems):
+    """
+    Move a rejected snapshot into the quarantine folder together with the reasons.
+
+    Args:
+        data: The rejected snapshot data.
+        kind (str): The dataset the snapshot belongs to, e.g. 'plugins'.
+        problems (list): The problems found by validation.
+
+    Returns:
+        str: The path of the quarantined file.
+    """
+    if not os.path.exists(quarantine_path):
+        os.makedirs(quarantine_path)
+
+    timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+    file_path = os.path.join(quarantine_path, f"{kind}_{timestamp}.json")
+    with open(file_path, 'w', encoding='utf-8') as file:
+        json.dump({'problems': problems, 'data': data}, file)
+
+    print(f"Rejected {kind} snapshot quarantined in {file_path}:")
+    for problem in problems:
+        print(f"  - {problem}")
+    return file_path
+
+def report_problems(problems):
+    """
+    Print validation problems that are worth a warning but do not reject the data.
+    """
+    for problem in problems:
+        print(f"Warning: {problem}")